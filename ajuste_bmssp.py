@@ -0,0 +1,189 @@
+# ajuste_bmssp.py
+# Ajuste automático dos parâmetros k, t e l_top do BMSSP
+# (dijkstra_artigo_corrigido.py).
+#
+# A prova fixa k = floor(log^{1/3} n) e t = floor(log^{2/3} n); para n prático
+# isso dá constantes pequenas que não são necessariamente as mais rápidas em
+# Python (cada nível de recursão, pull e find_pivots custa chamadas de função).
+# ajustar():
+#   1. tira uma amostra do grafo alvo: bola de BFS induzida com até
+#      max_vertices vértices (mantém a estrutura local e os graus). A
+#      profundidade mínima depende de n, então o ajuste transfere melhor
+#      quanto mais perto a amostra estiver do tamanho real; max_vertices=None
+#      mede no grafo inteiro;
+#   2. varre k x t x profundidade, com a profundidade dada como níveis extras
+#      acima de profundidade_minima(n, k, t), mais a configuração do paper,
+#      medindo com o harness do benchmark.py (aquecimento, mediana e
+#      conferência das distâncias contra o dijkstra_heap; configurações que
+#      divergem são descartadas);
+#   3. grava a mais rápida em ARQUIVO_PARAMETROS, na classe de tamanho
+#      (potência de 2) do grafo alvo. sssp_break_sorting_barrier(tuned=True)
+#      lê daí.
+#
+# Uso:
+#   python ajuste_bmssp.py                          # gnp de 20000 vértices
+#   python ajuste_bmssp.py --dimacs USA-road-d.NY.gr
+#   python ajuste_bmssp.py --binario grafo.csrg --max-vertices 50000
+
+from __future__ import annotations
+import argparse
+import json
+import random
+from array import array
+from collections import deque
+from typing import Dict, Optional, Sequence, Tuple
+
+from benchmark import Cenario, desregistrar, imprimir, registrar, rodar
+from dijkstra_artigo_corrigido import (
+    ARQUIVO_PARAMETROS,
+    _calc_params,
+    classe_tamanho,
+    profundidade_minima,
+    sssp_break_sorting_barrier,
+)
+from grafo_csr import CSRGraph, TARGET_TYPE, WEIGHT_TYPE
+
+
+def amostra_bfs(g: CSRGraph, max_vertices: int, seed=None) -> CSRGraph:
+    """
+    Subgrafo induzido pelos primeiros max_vertices vértices de uma BFS a
+    partir de um vértice sorteado (novas raízes sorteadas se a componente
+    acabar). O vértice 0 da amostra é a primeira raiz.
+    """
+    if g.n <= max_vertices:
+        return g
+    rng = random.Random(seed)
+    offsets, targets = g.offsets, g.targets
+    novo: Dict[int, int] = {}  # vértice original -> vértice na amostra
+    fila = deque()
+    while len(novo) < max_vertices:
+        if not fila:
+            s = rng.randrange(g.n)
+            if s not in novo:
+                novo[s] = len(novo)
+                fila.append(s)
+            continue
+        u = fila.popleft()
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            if v not in novo:
+                novo[v] = len(novo)
+                fila.append(v)
+                if len(novo) == max_vertices:
+                    break
+
+    src = array(TARGET_TYPE)
+    dst = array(TARGET_TYPE)
+    wts = array(WEIGHT_TYPE)
+    for u, iu in novo.items():
+        for v, w in g[u]:
+            iv = novo.get(v)
+            if iv is not None:
+                src.append(iu)
+                dst.append(iv)
+                wts.append(w)
+    return CSRGraph.from_arrays(len(novo), src, dst, wts)
+
+
+def _configuracoes(n: int, ks, ts, extras) -> Dict[str, Tuple[int, int, int]]:
+    k, t, l_top = _calc_params(n)
+    configs = {"bmssp_paper": (k, t, max(l_top, profundidade_minima(n, k, t)))}
+    for k in ks:
+        for t in ts:
+            minimo = profundidade_minima(n, k, t)
+            for extra in extras:
+                configs[f"bmssp_k{k}_t{t}_l{minimo + extra}"] = (k, t, minimo + extra)
+    return configs
+
+
+def ajustar(
+    graph,
+    ks: Sequence[int] = (1, 2, 3, 4),
+    ts: Sequence[int] = (2, 3, 4, 5, 6, 8),
+    extras: Sequence[int] = (0, 1),
+    max_vertices: Optional[int] = 20000,
+    repeticoes: int = 3,
+    aquecimento: int = 1,
+    seed: int = 0,
+    caminho: Optional[str] = ARQUIVO_PARAMETROS,
+) -> dict:
+    """
+    Varre os parâmetros numa amostra de `graph` e devolve o melhor item
+    {"k", "t", "l_top", "mediana_ms", "paper_ms", "n", "n_amostra"}, com as
+    linhas do benchmark em "linhas". Com caminho (padrão: ARQUIVO_PARAMETROS),
+    grava o item na classe de tamanho de graph, mantendo as outras classes.
+    """
+    g = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adj_list(graph)
+    amostra = g if max_vertices is None else amostra_bfs(g, max_vertices, seed)
+    configs = _configuracoes(amostra.n, ks, ts, extras)
+
+    for nome, (k, t, l_top) in configs.items():
+        registrar(nome)(lambda c, k=k, t=t, l_top=l_top:
+                        sssp_break_sorting_barrier(c.grafo, c.src, k=k, t=t, l_top=l_top)[0])
+    try:
+        cenario = Cenario(f"amostra_{amostra.n}", lambda _seed: amostra)
+        linhas = rodar([cenario], ["dijkstra_heap"] + list(configs),
+                       repeticoes=repeticoes, aquecimento=aquecimento, seed=seed)
+    finally:
+        for nome in configs:
+            desregistrar(nome)
+
+    medidas = {l["algoritmo"]: l["mediana_ms"] for l in linhas
+               if l["algoritmo"] in configs and l["distancias"] == "ok"}
+    if not medidas:
+        raise RuntimeError("nenhuma configuração devolveu as distâncias corretas")
+    nome = min(medidas, key=medidas.get)
+    k, t, l_top = configs[nome]
+    melhor = {
+        "k": k,
+        "t": t,
+        "l_top": l_top,
+        "mediana_ms": medidas[nome],
+        "paper_ms": medidas.get("bmssp_paper"),
+        "n": g.n,
+        "n_amostra": amostra.n,
+    }
+
+    if caminho is not None:
+        try:
+            with open(caminho) as f:
+                tabela = json.load(f)
+        except FileNotFoundError:
+            tabela = {}
+        tabela[classe_tamanho(g.n)] = melhor
+        with open(caminho, "w") as f:
+            json.dump(tabela, f, indent=2, sort_keys=True)
+
+    return dict(melhor, linhas=linhas)
+
+
+if __name__ == "__main__":
+    from geradores import gnp
+    from grafo_binario import load_binary
+    from importadores import read_dimacs_gr
+
+    parser = argparse.ArgumentParser(description="Ajuste de k, t e l_top do BMSSP")
+    parser.add_argument("--dimacs", help="grafo alvo em DIMACS .gr")
+    parser.add_argument("--binario", help="grafo alvo no formato de grafo_binario.py")
+    parser.add_argument("--n", type=int, default=20000, help="sem arquivo: gnp com n vértices")
+    parser.add_argument("--grau", type=float, default=10.0, help="sem arquivo: grau médio do gnp")
+    parser.add_argument("--max-vertices", type=int, default=20000,
+                        help="tamanho da amostra (0: grafo inteiro)")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--arquivo", default=ARQUIVO_PARAMETROS, help="JSON dos parâmetros ajustados")
+    args = parser.parse_args()
+
+    if args.dimacs:
+        g = read_dimacs_gr(args.dimacs)
+    elif args.binario:
+        g = load_binary(args.binario)
+    else:
+        g = gnp(args.n, args.grau / args.n, seed=args.seed)
+
+    resultado = ajustar(g, max_vertices=args.max_vertices or None, repeticoes=args.repeticoes,
+                        seed=args.seed, caminho=args.arquivo)
+    imprimir(resultado["linhas"])
+    paper = resultado["paper_ms"]
+    print(f"\nclasse {classe_tamanho(g.n)}: k={resultado['k']}, t={resultado['t']}, "
+          f"l_top={resultado['l_top']}: {resultado['mediana_ms']:.3f} ms "
+          f"(paper: {'-' if paper is None else f'{paper:.3f}'} ms) -> {args.arquivo}")
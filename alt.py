@@ -0,0 +1,216 @@
+# alt.py
+# ALT = A* + Landmarks + desigualdade Triangular, para consultas ponto a ponto
+# repetidas em um grafo estático.
+#
+# Pré-processamento (uma vez):
+#   - escolhe k landmarks por "ponto mais distante": cada novo landmark é o
+#     vértice mais longe dos já escolhidos;
+#   - guarda d(L, v) e d(v, L) para todo v e landmark L (dijkstra_heap no
+#     grafo e no transposto), em array('f') de float32: k * 2 * 4 bytes por
+#     vértice.
+# Consulta src -> target: A* com a cota inferior
+#     h(v) = max_L max(d(L, t) - d(L, v), d(v, L) - d(t, L)) <= d(v, t)
+# que puxa a busca na direção do alvo, em vez de explorar o grafo todo.
+#
+# O índice pode ser salvo em disco (save) e recarregado sem recalcular (load);
+# o arquivo guarda o fingerprint do grafo, e load recusa um grafo diferente
+# (mesmo n com outros pesos daria cotas inválidas, e distâncias erradas).
+
+from __future__ import annotations
+import heapq
+import struct
+from array import array
+from typing import List, Optional, Tuple
+
+from dijkstra_heap import dijkstra_heap
+from grafo_csr import CSRGraph
+from sssp_lote import batch_sssp
+
+INF = float("inf")
+
+# Cabeçalho do arquivo: assinatura, n, k, fingerprint do grafo (16 bytes)
+_MAGICO = b"ALT2"
+_CABECALHO = struct.Struct("<4sqq16s")
+
+# float32 tem erro relativo <= 2^-24; descontar 2^-23 * (|a| + |b|) da
+# diferença mantém a cota inferior válida depois do arredondamento
+_FOLGA = 2.0 ** -23
+
+
+class ALTIndex:
+    """
+    Índice ALT sobre um CSRGraph (pesos >= 0).
+      - landmarks: array('i') com os k vértices escolhidos
+      - de_landmark[i][v] = d(landmarks[i], v)   (float32)
+      - para_landmark[i][v] = d(v, landmarks[i]) (float32)
+    """
+
+    def __init__(self, graph: CSRGraph, landmarks, de_landmark, para_landmark):
+        self.graph = graph
+        self.landmarks = landmarks
+        self.de_landmark = de_landmark
+        self.para_landmark = para_landmark
+
+    # ------------------------------------------------------------------
+    # Pré-processamento
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, graph, k: int = 8, inicio: int = 0, workers: int = 1) -> "ALTIndex":
+        """
+        Escolhe até k landmarks (ponto mais distante a partir de `inicio`) e
+        calcula as tabelas. workers > 1 paraleliza as buscas no transposto
+        (batch_sssp); a escolha em si é sequencial.
+        """
+        g = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adj_list(graph)
+        n = g.n
+        landmarks = array("i")
+        de_landmark: List[array] = []
+        if n == 0:
+            return cls(g, landmarks, de_landmark, [])
+
+        # mais_perto[v] = min_L d(L, v); inf conta como "mais longe" e puxa
+        # landmarks para regiões ainda não alcançadas
+        mais_perto, _pred = dijkstra_heap(g, inicio)
+        escolhidos = set()
+        for _ in range(min(k, n)):
+            candidato = max(
+                (v for v in range(n) if v not in escolhidos),
+                key=mais_perto.__getitem__,
+            )
+            if mais_perto[candidato] == 0 and landmarks:
+                break  # todos os vértices já coincidem com algum landmark
+            escolhidos.add(candidato)
+            landmarks.append(candidato)
+            dist, _pred = dijkstra_heap(g, candidato)
+            de_landmark.append(array("f", dist))
+            mais_perto = [min(a, b) for a, b in zip(mais_perto, dist)] if len(landmarks) > 1 else dist
+
+        reverso = g.reverse()
+        para = dict(batch_sssp(reverso, landmarks, "dijkstra", workers))
+        para_landmark = [array("f", para[L]) for L in landmarks]
+        return cls(g, landmarks, de_landmark, para_landmark)
+
+    # ------------------------------------------------------------------
+    # Persistência
+    # ------------------------------------------------------------------
+    def save(self, caminho: str) -> None:
+        with open(caminho, "wb") as f:
+            f.write(_CABECALHO.pack(_MAGICO, self.graph.n, len(self.landmarks),
+                                    bytes.fromhex(self.graph.fingerprint())))
+            self.landmarks.tofile(f)
+            for tabela in self.de_landmark:
+                tabela.tofile(f)
+            for tabela in self.para_landmark:
+                tabela.tofile(f)
+
+    @classmethod
+    def load(cls, caminho: str, graph) -> "ALTIndex":
+        """
+        Recarrega um índice salvo por save(); graph deve ser o mesmo grafo.
+        """
+        g = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adj_list(graph)
+        with open(caminho, "rb") as f:
+            magico, n, k, impressao = _CABECALHO.unpack(f.read(_CABECALHO.size))
+            if magico != _MAGICO:
+                raise ValueError(f"{caminho}: não é um índice ALT")
+            if n != g.n:
+                raise ValueError(f"{caminho}: índice para {n} vértices, grafo tem {g.n}")
+            if impressao.hex() != g.fingerprint():
+                raise ValueError(f"{caminho}: índice calculado para outro grafo (fingerprint diferente)")
+            landmarks = array("i")
+            landmarks.fromfile(f, k)
+            tabelas = []
+            for _ in range(2 * k):
+                tabela = array("f")
+                tabela.fromfile(f, n)
+                tabelas.append(tabela)
+        return cls(g, landmarks, tabelas[:k], tabelas[k:])
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    def cota_inferior(self, v: int, target: int) -> float:
+        """
+        Cota inferior de d(v, target) pelos landmarks (inf = target inalcançável).
+        """
+        h = 0.0
+        for de, para in zip(self.de_landmark, self.para_landmark):
+            # d(v, t) >= d(L, t) - d(L, v)
+            a, b = de[target], de[v]
+            if b != INF:
+                c = a - b - _FOLGA * (a + b) if a != INF else INF
+                if c > h:
+                    h = c
+            # d(v, t) >= d(v, L) - d(t, L)
+            a, b = para[v], para[target]
+            if b != INF:
+                c = a - b - _FOLGA * (a + b) if a != INF else INF
+                if c > h:
+                    h = c
+        return h
+
+    def query(self, src: int, target: int) -> Tuple[float, List[int]]:
+        """
+        A* de src até target. Retorna (distância, caminho); (inf, []) se
+        inalcançável.
+        """
+        g = self.graph
+        cota = self.cota_inferior
+        h = {src: cota(src, target)}
+        if h[src] == INF:
+            return INF, []
+
+        dist = {src: 0.0}
+        pred = {}
+        heap = [(h[src], src)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        while heap:
+            f, u = heappop(heap)
+            du = dist[u]
+            # entrada obsoleta; sem conjunto de fechados, um vértice pode ser
+            # reaberto (a cota em float32 é admissível, mas não exatamente consistente)
+            if f > du + h[u]:
+                continue
+            if u == target:
+                caminho = [u]
+                while u != src:
+                    u = pred[u]
+                    caminho.append(u)
+                caminho.reverse()
+                return du, caminho
+            for v, w in g[u]:
+                nd = du + w
+                if nd < dist.get(v, INF):
+                    hv = h.get(v)
+                    if hv is None:
+                        hv = h[v] = cota(v, target)
+                    if hv == INF:
+                        continue
+                    dist[v] = nd
+                    pred[v] = u
+                    heappush(heap, (nd + hv, v))
+        return INF, []
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    adj_list = [
+        [(1, 4), (2, 2)],
+        [(2, 3), (3, 2), (4, 3)],
+        [(1, 1), (3, 4), (4, 5)],
+        [],
+        [(3, 1)],
+    ]
+    indice = ALTIndex.build(adj_list, k=2)
+    print("landmarks:", list(indice.landmarks))
+    for t in range(5):
+        print(f"0 -> {t}:", indice.query(0, t))
+
+    caminho = os.path.join(tempfile.gettempdir(), "alt_exemplo.bin")
+    indice.save(caminho)
+    recarregado = ALTIndex.load(caminho, indice.graph)
+    print("recarregado 0 -> 3:", recarregado.query(0, 3))
+    os.remove(caminho)
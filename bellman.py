@@ -1,19 +1,69 @@
-def bellman_ford_edgelist(graph_edges, V, E, src):
+from collections import deque
+from array import array
+
+import instrumentacao
+from grafo_csr import CSRGraph
+
+# Sentinela de "sem predecessor" (mesma do dijkstra_heap)
+NO_PRED = -1
+
+def bellman_ford_edgelist(graph_edges, V, E, src, engine="python"):
     """
     Implementação do Bellman-Ford baseada no slide.
     Entrada:
         graph_edges: Lista de arestas, onde cada item é [u, v, w].
+                     Também aceita um CSRGraph (nesse caso E é ignorado).
         V: Número de vértices.
         E: Número de arestas.
         src: Vértice de origem.
+        engine: "python" (laço por aresta) ou "numpy" (cada passada vetorizada,
+                ver _bellman_ford_numpy). Mesma saída nos dois casos.
+    Contadores (instrumentacao.py): passadas, relaxacoes (E por passada) e
+    melhorias.
     """
     
+    if engine == "numpy":
+        return _bellman_ford_numpy(graph_edges, V, E, src)
+    
     # Inicialização (Linhas 3-7)
     dis = [float('inf')] * V
     dis[src] = 0
     
+    distancias = dis
+    c = instrumentacao.ativos
+    if c is not None:
+        dis = instrumentacao.EscritasContadas(dis, c)
+    
+    if isinstance(graph_edges, CSRGraph):
+        # Arestas já estão em arrays paralelos: varre com zip, sem indexar listas
+        us = graph_edges.edge_sources()
+        vs = graph_edges.targets
+        ws = graph_edges.weights
+        for i in range(V - 1):
+            if c is not None:
+                c["passadas"] += 1
+                c["relaxacoes"] += len(vs)
+            mudou = False
+            for u, v, w in zip(us, vs, ws):
+                if dis[u] + w < dis[v]:
+                    dis[v] = dis[u] + w
+                    mudou = True
+            if not mudou:
+                break
+        
+        for x, y, weight in zip(us, vs, ws):
+            if dis[x] + weight < dis[y]:
+                print("Grafo contém ciclo de tamanho negativo")
+                return
+        return distancias
+    
     # Relaxamento das arestas V-1 vezes (Linhas 9-15)
+    # Para antes se uma passada inteira não melhorou nenhuma distância
     for i in range(V - 1):
+        if c is not None:
+            c["passadas"] += 1
+            c["relaxacoes"] += E
+        mudou = False
         for j in range(E):
             u = graph_edges[j][0]
             v = graph_edges[j][1]
@@ -22,6 +72,10 @@ def bellman_ford_edgelist(graph_edges, V, E, src):
             # Verifica se podemos melhorar o caminho para v passando por u
             if dis[u] != float('inf') and dis[u] + w < dis[v]:
                 dis[v] = dis[u] + w
+                mudou = True
+        
+        if not mudou:
+            break
 
     # Verificação de Ciclo Negativo (Linhas 17-25)
     for i in range(E):
@@ -33,30 +87,159 @@ def bellman_ford_edgelist(graph_edges, V, E, src):
             print("Grafo contém ciclo de tamanho negativo")
             return # Encerra se achar ciclo negativo
 
+    return distancias
+
+def _bellman_ford_numpy(graph_edges, V, E, src):
+    """
+    Bellman-Ford com as arestas em três arrays NumPy (origem, destino, peso).
+    Cada passada é um gather/add/scatter:
+        cand = dis[us] + ws;  np.minimum.at(dis, vs, cand)
+    com parada quando a passada não muda nada e verificação de ciclo
+    negativo em uma última passada, como no laço do slide.
+    Contadores: os mesmos da versão em Python, contados por passada (aqui
+    melhorias são os vértices cuja distância caiu em cada passada).
+    """
+    import numpy as np
+    
+    if isinstance(graph_edges, CSRGraph):
+        us = np.asarray(graph_edges.edge_sources(), dtype=np.int32)
+        vs = np.asarray(graph_edges.targets, dtype=np.int32)
+        ws = np.asarray(graph_edges.weights, dtype=np.float64)
+    else:
+        arestas = np.asarray(graph_edges[:E], dtype=np.float64).reshape(-1, 3)
+        us = arestas[:, 0].astype(np.intp)
+        vs = arestas[:, 1].astype(np.intp)
+        ws = arestas[:, 2].copy()
+    
+    dis = np.full(V, np.inf)
+    dis[src] = 0.0
+    
+    c = instrumentacao.ativos
+    for i in range(V - 1):
+        anterior = dis.copy()
+        np.minimum.at(dis, vs, anterior[us] + ws)
+        if c is not None:
+            c["passadas"] += 1
+            c["relaxacoes"] += len(vs)
+            c["melhorias"] += int(np.count_nonzero(dis < anterior))
+        if np.array_equal(dis, anterior):
+            break
+    
+    # Verificação de Ciclo Negativo
+    if np.any(dis[us] + ws < dis[vs]):
+        print("Grafo contém ciclo de tamanho negativo")
+        return
+    
+    return dis.tolist()
+
+def bellman_ford_queue(graph_edges, V, E, src):
+    """
+    Bellman-Ford com fila (SPFA).
+    Só re-relaxa as arestas que saem de vértices cuja distância mudou:
+    fila FIFO + flag in_queue, e termina quando a fila esvazia (equivale a
+    parar na primeira passada sem mudança).
+    Entrada: mesma do bellman_ford_edgelist (lista de arestas [u, v, w] ou CSRGraph).
+    Retorna (dis, pred, ciclo):
+        - dis: distâncias a partir de src
+        - pred: predecessor de cada vértice (array int32, -1 = sem pai)
+        - ciclo: None, ou a lista de vértices de um ciclo negativo alcançável
+          a partir de src, na ordem das arestas (o último liga no primeiro).
+          Nesse caso dis/pred não são distâncias válidas.
+    Contadores (instrumentacao.py): expansoes (vértices tirados da fila),
+    relaxacoes e melhorias.
+    """
+    g = graph_edges if isinstance(graph_edges, CSRGraph) else CSRGraph.from_edges(V, graph_edges[:E])
+    
+    dis = [float('inf')] * V
+    dis[src] = 0
+    pred = array('i', [NO_PRED]) * V
+    predecessores = pred
+    c = instrumentacao.ativos
+    if c is not None:
+        g = instrumentacao.GrafoContado(g, c)
+        pred = instrumentacao.EscritasContadas(pred, c)
+    # nº de arestas do caminho atual até v: chegar a V denuncia ciclo negativo
+    cnt = array('i', bytes(4 * V))
+    in_queue = bytearray(V)
+    
+    fila = deque([src])
+    in_queue[src] = 1
+    while fila:
+        u = fila.popleft()
+        in_queue[u] = 0
+        du = dis[u]
+        cu = cnt[u] + 1
+        for v, w in g[u]:
+            if du + w < dis[v]:
+                dis[v] = du + w
+                pred[v] = u
+                cnt[v] = cu
+                if cu >= V:
+                    ciclo = ciclo_predecessores(pred, v)
+                    if ciclo is not None:
+                        return dis, predecessores, ciclo
+                if not in_queue[v]:
+                    in_queue[v] = 1
+                    fila.append(v)
+    
+    return dis, predecessores, None
+
+def ciclo_predecessores(pred, inicio):
+    """
+    Segue pred a partir de `inicio`. Se cair em um ciclo, devolve seus vértices
+    na ordem das arestas; se chegar na origem (-1), devolve None.
+    No Bellman-Ford, um ciclo no grafo de predecessores é sempre negativo.
+    """
+    posicao = {}
+    caminho = []
+    x = inicio
+    while x != NO_PRED and x not in posicao:
+        posicao[x] = len(caminho)
+        caminho.append(x)
+        x = pred[x]
+    if x == NO_PRED:
+        return None
+    # caminho anda para trás (filho -> pai); invertido fica na ordem das arestas
+    ciclo = caminho[posicao[x]:]
+    ciclo.reverse()
+    return ciclo
+
+def imprimir_distancias(dis):
     # Impressão dos resultados (Linhas 27-29)
     print("Distância do vértice até a origem")
-    for i in range(V):
+    for i in range(len(dis)):
         print(f"{i} \t\t {dis[i]}")
-        
-    return dis
-
-# Configuração do Grafo da imagem 1 para Bellman-Ford
-V_bf = 6  # Total de vértices (1 a 6)
-E_bf = 8  # Total de arestas
-src_bf = 0 # Vértice de origem (1 na imagem virou 0)
-
-# Lista de Arestas [origem, destino, peso]
-# Ajustado para índices começando em 0
-edges_bf = [
-    [0, 5, 8],   # 1 -> 6 (peso 8)
-    [0, 1, 10],  # 1 -> 2 (peso 10)
-    [5, 4, 1],   # 6 -> 5 (peso 1)
-    [4, 1, -4],  # 5 -> 2 (peso -4)
-    [4, 3, -1],  # 5 -> 4 (peso -1)
-    [1, 3, 2],   # 2 -> 4 (peso 2) -> Assumindo a seta diagonal descendo
-    [3, 2, -2],  # 4 -> 3 (peso -2)
-    [2, 1, 1]    # 3 -> 2 (peso 1)
-]
-
-print("--- Teste Bellman-Ford ---")
-bellman_ford_edgelist(edges_bf, V_bf, E_bf, src_bf)
\ No newline at end of file
+
+if __name__ == "__main__":
+    # Configuração do Grafo da imagem 1 para Bellman-Ford
+    V_bf = 6  # Total de vértices (1 a 6)
+    E_bf = 8  # Total de arestas
+    src_bf = 0 # Vértice de origem (1 na imagem virou 0)
+
+    # Lista de Arestas [origem, destino, peso]
+    # Ajustado para índices começando em 0
+    edges_bf = [
+        [0, 5, 8],   # 1 -> 6 (peso 8)
+        [0, 1, 10],  # 1 -> 2 (peso 10)
+        [5, 4, 1],   # 6 -> 5 (peso 1)
+        [4, 1, -4],  # 5 -> 2 (peso -4)
+        [4, 3, -1],  # 5 -> 4 (peso -1)
+        [1, 3, 2],   # 2 -> 4 (peso 2) -> Assumindo a seta diagonal descendo
+        [3, 2, -2],  # 4 -> 3 (peso -2)
+        [2, 1, 1]    # 3 -> 2 (peso 1)
+    ]
+
+    print("--- Teste Bellman-Ford ---")
+    imprimir_distancias(bellman_ford_edgelist(edges_bf, V_bf, E_bf, src_bf))
+
+    print("\n--- Teste Bellman-Ford (CSR) ---")
+    imprimir_distancias(bellman_ford_edgelist(CSRGraph.from_edges(V_bf, edges_bf), V_bf, E_bf, src_bf))
+
+    print("\n--- Teste Bellman-Ford com fila (SPFA) ---")
+    dis, pred, ciclo = bellman_ford_queue(edges_bf, V_bf, E_bf, src_bf)
+    imprimir_distancias(dis)
+
+    # Mesmo grafo com 3 -> 2 (peso -5): fecha o ciclo 2 -> 4 -> 3 -> 2 de peso -5
+    edges_ciclo = edges_bf[:-1] + [[2, 1, -5]]
+    dis, pred, ciclo = bellman_ford_queue(edges_ciclo, V_bf, E_bf, src_bf)
+    print("Ciclo negativo:", [v + 1 for v in ciclo])
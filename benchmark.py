@@ -0,0 +1,567 @@
+# benchmark.py
+# Framework de benchmark dos algoritmos de caminho mínimo.
+#
+# Diferenças para o rodar_benchmark_completo (comparacao.py):
+#   - registro de algoritmos (@registrar), em vez de chamadas fixas no laço;
+#   - cenários configuráveis (Cenario: nome + gerador com semente, ver
+#     geradores.py), então todas as rodadas e máquinas medem o mesmo grafo;
+#   - rodadas de aquecimento antes das medidas;
+#   - mediana, p95 e desvio padrão em vez de média de 5;
+#   - verificação cruzada: todos os algoritmos devem devolver as mesmas
+#     distâncias que o de referência (o primeiro da lista);
+#   - baseline em JSON: salvar_baseline() guarda as medianas, e
+#     comparar_baseline() aponta os pares (cenário, algoritmo) que ficaram
+#     mais lentos que a tolerância;
+#   - rodar_isolado(): cada (cenário, algoritmo, rodada) em um processo novo,
+#     vários em paralelo, cada um preso a um núcleo, com prazo para gerar o
+#     grafo e prazo por rodada ("timed out" em vez de travar a bateria) e
+#     resultados agregados conforme chegam. Nada do heap/GC de uma medida contamina a seguinte;
+#   - contadores=True: uma execução extra, fora das medidas, com a
+#     instrumentação ligada (instrumentacao.py); as contagens (relaxacoes,
+#     obsoletas, bmssp_nivel_<l>, ...) viram colunas a mais no CSV.
+#
+# Uso:
+#   python benchmark.py                                  # roda e imprime
+#   python benchmark.py --salvar-baseline base.json
+#   python benchmark.py --baseline base.json --tolerancia 0.15
+#   python benchmark.py --isolado --workers 8 --timeout 30
+#   python benchmark.py --contadores --csv contagens.csv
+# Sai com código 1 se houver divergência de distâncias ou regressão.
+
+from __future__ import annotations
+import argparse
+import csv
+import gc
+import json
+import math
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from array import array
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Callable, Dict, List, Optional
+
+import instrumentacao
+from bellman import bellman_ford_edgelist, bellman_ford_queue
+from dijkstra import dijkstra_dense, dijkstra_matrix, matriz_inf
+from dijkstra_artigo import dijkstra_simplified_bands
+from dijkstra_artigo_corrigido import sssp_break_sorting_barrier
+from dijkstra_heap import dijkstra_heap
+from geradores import geometrico, gnp, grade_2d
+from grafo_csr import CSRGraph
+
+
+# ---------------------------------------------------------------------------
+# Cenários
+# ---------------------------------------------------------------------------
+class Cenario:
+    """
+    Um grafo de teste: gerar(seed) -> CSRGraph. As outras representações
+    (matriz, matriz NumPy com inf, lista de arestas) são montadas sob demanda
+    e reaproveitadas.
+    """
+
+    def __init__(self, nome: str, gerar: Callable[[int], CSRGraph], src: int = 0):
+        self.nome = nome
+        self.gerar = gerar
+        self.src = src
+        self.grafo: Optional[CSRGraph] = None
+        self._matriz = None
+        self._matriz_inf = None
+        self._arestas = None
+
+    def preparar(self, seed: int) -> None:
+        self.grafo = self.gerar(seed)
+        self._matriz = None
+        self._matriz_inf = None
+        self._arestas = None
+
+    @property
+    def matriz(self):
+        if self._matriz is None:
+            n = self.grafo.n
+            self._matriz = [[0] * n for _ in range(n)]
+            for u, v, w in self.grafo.edges():
+                self._matriz[u][v] = w
+        return self._matriz
+
+    @property
+    def matriz_inf(self):
+        if self._matriz_inf is None:
+            self._matriz_inf = matriz_inf(self.grafo)
+        return self._matriz_inf
+
+    @property
+    def arestas(self):
+        if self._arestas is None:
+            self._arestas = [[u, v, w] for u, v, w in self.grafo.edges()]
+        return self._arestas
+
+
+def cenarios_padrao() -> List[Cenario]:
+    return [
+        Cenario("gnp_500_d10", lambda s: gnp(500, 10 / 500, seed=s)),
+        Cenario("gnp_2000_d10", lambda s: gnp(2000, 10 / 2000, seed=s)),
+        Cenario("gnp_200_denso", lambda s: gnp(200, 0.3, seed=s)),
+        Cenario("grade_50x50", lambda s: grade_2d(50, 50, seed=s)),
+        Cenario("geometrico_5000", lambda s: geometrico(5000, 6, seed=s)),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Registro de algoritmos
+# ---------------------------------------------------------------------------
+# nome -> (função(cenário) -> distâncias, maior n aceito ou None)
+ALGORITMOS: Dict[str, tuple] = {}
+# nome -> propriedades do Cenario que a função usa (montadas fora da medida)
+ENTRADAS: Dict[str, tuple] = {}
+
+
+def registrar(nome: str, max_n: Optional[int] = None, entradas: tuple = ()):
+    """
+    Decorador: registra f(cenario) -> lista de distâncias a partir de cenario.src.
+    max_n pula cenários grandes demais (ex.: algoritmos O(V^2) de memória).
+    entradas: representações do cenário que f lê ("matriz", "matriz_inf",
+    "arestas"); são montadas antes do cronômetro, não dentro da medida.
+    """
+    def decorar(f):
+        ALGORITMOS[nome] = (f, max_n)
+        ENTRADAS[nome] = tuple(entradas)
+        return f
+    return decorar
+
+
+def desregistrar(nome: str) -> None:
+    """
+    Remove um algoritmo registrado (ex.: configurações temporárias do ajuste_bmssp.py).
+    """
+    ALGORITMOS.pop(nome, None)
+    ENTRADAS.pop(nome, None)
+
+
+def _montar_entradas(cenario: Cenario, nome: str) -> None:
+    for propriedade in ENTRADAS.get(nome, ()):
+        getattr(cenario, propriedade)
+
+
+@registrar("dijkstra_heap")
+def _dijkstra_heap(c):
+    return dijkstra_heap(c.grafo, c.src)[0]
+
+
+@registrar("artigo")
+def _artigo(c):
+    return sssp_break_sorting_barrier(c.grafo, c.src)[0]
+
+
+# mesma chamada do motor "artigo_ajustado" do despacho.py
+@registrar("artigo_ajustado")
+def _artigo_ajustado(c):
+    return sssp_break_sorting_barrier(c.grafo, c.src, tuned=True)[0]
+
+
+@registrar("delta_stepping")
+def _delta(c):
+    return dijkstra_simplified_bands(c.grafo, c.grafo.n, c.src)
+
+
+@registrar("bellman_ford", max_n=5000, entradas=("arestas",))
+def _bellman_ford(c):
+    return bellman_ford_edgelist(c.arestas, c.grafo.n, c.grafo.num_edges, c.src)
+
+
+# bellman_ford e dijkstra_matrix direto no CSR, como os roda o despacho.py
+@registrar("bellman_ford_csr", max_n=5000)
+def _bellman_ford_csr(c):
+    return bellman_ford_edgelist(c.grafo, c.grafo.n, c.grafo.num_edges, c.src)
+
+
+@registrar("bellman_ford_numpy")
+def _bellman_ford_numpy(c):
+    return bellman_ford_edgelist(c.grafo, c.grafo.n, c.grafo.num_edges, c.src, engine="numpy")
+
+
+@registrar("spfa")
+def _spfa(c):
+    return bellman_ford_queue(c.grafo, c.grafo.n, c.grafo.num_edges, c.src)[0]
+
+
+@registrar("dijkstra_matrix", max_n=2000, entradas=("matriz",))
+def _dijkstra_matrix(c):
+    return dijkstra_matrix(c.matriz, c.src)
+
+
+@registrar("dijkstra_matrix_csr", max_n=2000)
+def _dijkstra_matrix_csr(c):
+    return dijkstra_matrix(c.grafo, c.src)
+
+
+@registrar("dijkstra_dense", max_n=5000, entradas=("matriz_inf",))
+def _dijkstra_dense(c):
+    return dijkstra_dense(c.matriz_inf, c.src)
+
+
+# ---------------------------------------------------------------------------
+# Execução
+# ---------------------------------------------------------------------------
+def _percentil(valores: List[float], p: float) -> float:
+    # interpolação linear entre os vizinhos (mesmo critério do numpy.percentile)
+    ordenados = sorted(valores)
+    pos = (len(ordenados) - 1) * p
+    baixo = math.floor(pos)
+    alto = min(baixo + 1, len(ordenados) - 1)
+    return ordenados[baixo] + (ordenados[alto] - ordenados[baixo]) * (pos - baixo)
+
+
+def _mesmas_distancias(a, b) -> bool:
+    if len(a) != len(b):
+        return False
+    for x, y in zip(a, b):
+        if x != y and not abs(x - y) <= 1e-9 * max(1.0, abs(x), abs(y)):
+            return False
+    return True
+
+
+def rodar(
+    cenarios: Optional[List[Cenario]] = None,
+    algoritmos: Optional[List[str]] = None,
+    repeticoes: int = 7,
+    aquecimento: int = 1,
+    seed: int = 0,
+    contadores: bool = False,
+) -> List[dict]:
+    """
+    Mede cada algoritmo em cada cenário. Retorna uma linha por par com
+    mediana/p95/desvio (ms), número de medidas e se as distâncias conferem
+    com as do primeiro algoritmo ("ok", "DIVERGE", "pulado" ou o erro).
+    contadores=True acrescenta as contagens de uma execução instrumentada.
+    """
+    cenarios = cenarios_padrao() if cenarios is None else cenarios
+    algoritmos = list(ALGORITMOS) if algoritmos is None else algoritmos
+    linhas = []
+    for cenario in cenarios:
+        cenario.preparar(seed)
+        g = cenario.grafo
+        print(f"{cenario.nome}: V={g.n}, E={g.num_edges}", file=sys.stderr)
+        referencia = None
+        for nome in algoritmos:
+            f, max_n = ALGORITMOS[nome]
+            linha = {"cenario": cenario.nome, "algoritmo": nome, "V": g.n, "E": g.num_edges}
+            if max_n is not None and g.n > max_n:
+                linha.update(mediana_ms=None, p95_ms=None, desvio_ms=None, medidas=0, distancias="pulado")
+                linhas.append(linha)
+                continue
+            try:
+                _montar_entradas(cenario, nome)
+                for _ in range(aquecimento):
+                    dist = f(cenario)
+                tempos = []
+                for _ in range(repeticoes):
+                    inicio = time.perf_counter()
+                    dist = f(cenario)
+                    tempos.append((time.perf_counter() - inicio) * 1000)
+                if contadores:
+                    with instrumentacao.contar() as contagens:
+                        f(cenario)
+            except Exception as e:  # um algoritmo quebrado não derruba a rodada
+                linha.update(mediana_ms=None, p95_ms=None, desvio_ms=None, medidas=0,
+                             distancias=f"erro: {type(e).__name__}: {e}")
+                linhas.append(linha)
+                continue
+
+            dist = list(dist)
+            if referencia is None:
+                referencia = dist
+                conferencia = "ok"
+            else:
+                conferencia = "ok" if _mesmas_distancias(referencia, dist) else "DIVERGE"
+            linha.update(
+                mediana_ms=statistics.median(tempos),
+                p95_ms=_percentil(tempos, 0.95),
+                desvio_ms=statistics.stdev(tempos) if len(tempos) > 1 else 0.0,
+                medidas=len(tempos),
+                distancias=conferencia,
+            )
+            if contadores:
+                linha.update(sorted(contagens.items()))
+            linhas.append(linha)
+    return linhas
+
+
+# ---------------------------------------------------------------------------
+# Execução isolada por processo
+# ---------------------------------------------------------------------------
+def _nucleos() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _tarefa_isolada(conn, cenario, nome, seed, aquecimento, nucleo, contadores):
+    # Roda no processo filho: prepara o grafo, avisa "pronto" (o prazo da
+    # rodada conta a partir daí; antes vale o da geração), aquece e mede uma vez (e, com contadores, roda mais uma
+    # vez instrumentado).
+    if nucleo is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {nucleo})
+    cenario.preparar(seed)
+    g = cenario.grafo
+    f, max_n = ALGORITMOS[nome]
+    if max_n is not None and g.n > max_n:
+        conn.send(("pronto", g.n, g.num_edges))
+        conn.send(("pulado",))
+        return
+    _montar_entradas(cenario, nome)
+    conn.send(("pronto", g.n, g.num_edges))
+    try:
+        for _ in range(aquecimento):
+            f(cenario)
+        gc.collect()
+        inicio = time.perf_counter()
+        dist = f(cenario)
+        tempo = (time.perf_counter() - inicio) * 1000
+        contagens = None
+        if contadores:
+            with instrumentacao.contar() as contagens:
+                f(cenario)
+            contagens = dict(contagens)
+        conn.send(("ok", tempo, array("d", dist), contagens))
+    except Exception as e:
+        conn.send(("erro", f"{type(e).__name__}: {e}"))
+
+
+def rodar_isolado(
+    cenarios: Optional[List[Cenario]] = None,
+    algoritmos: Optional[List[str]] = None,
+    repeticoes: int = 5,
+    aquecimento: int = 1,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    timeout: float = 60.0,
+    contadores: bool = False,
+    timeout_geracao: Optional[float] = None,
+) -> List[dict]:
+    """
+    Como rodar(), mas cada rodada em um processo novo (até `workers` ao mesmo
+    tempo, cada um preso a um núcleo). Uma rodada que passa de `timeout`
+    segundos (sem contar a geração do grafo) é morta e conta como "timed out";
+    a geração tem prazo próprio, `timeout_geracao` segundos a partir do início
+    do processo (None: o mesmo `timeout`), e estourá-lo também conta como
+    "timed out".
+    As linhas têm as mesmas colunas de rodar() mais "timeouts"; com
+    contadores=True, a primeira rodada de cada par também conta.
+    Usa fork quando disponível: os cenários (com lambdas) não precisam ser
+    serializáveis.
+    """
+    cenarios = cenarios_padrao() if cenarios is None else cenarios
+    algoritmos = list(ALGORITMOS) if algoritmos is None else algoritmos
+    metodos = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in metodos else None)
+    nucleos = _nucleos()
+    workers = workers or len(nucleos)
+    timeout_geracao = timeout if timeout_geracao is None else timeout_geracao
+
+    tarefas = deque((i, nome, r) for i in range(len(cenarios)) for nome in algoritmos for r in range(repeticoes))
+    total = len(tarefas)
+    # agregado por (cenário, algoritmo)
+    agregado = {
+        (i, nome): {"tempos": [], "timeouts": 0, "erro": None, "pulado": False, "dist": None, "contagens": None}
+        for i in range(len(cenarios)) for nome in algoritmos
+    }
+    tamanhos = {}
+    livres = list(range(workers))
+    ativos = {}  # conexão -> [processo, tarefa, vaga, prazo, grafo pronto]
+    feitas = 0
+
+    def encerrar(conn, situacao):
+        nonlocal feitas
+        proc, (i, nome, r), vaga, _prazo, _pronto = ativos.pop(conn)
+        proc.join()
+        conn.close()
+        livres.append(vaga)
+        feitas += 1
+        print(f"[{feitas}/{total}] {cenarios[i].nome}/{nome} rodada {r}: {situacao}", file=sys.stderr)
+
+    while tarefas or ativos:
+        while tarefas and livres:
+            vaga = livres.pop()
+            i, nome, r = tarefa = tarefas.popleft()
+            pai, filho = ctx.Pipe(duplex=False)
+            nucleo = nucleos[vaga % len(nucleos)] if workers <= len(nucleos) else None
+            proc = ctx.Process(target=_tarefa_isolada,
+                               args=(filho, cenarios[i], nome, seed, aquecimento, nucleo,
+                                     contadores and r == 0))
+            proc.start()
+            filho.close()
+            # até o "pronto", o prazo é o da geração do grafo
+            ativos[pai] = [proc, tarefa, vaga, time.monotonic() + timeout_geracao, False]
+
+        agora = time.monotonic()
+        espera = max(0.0, min(a[3] for a in ativos.values()) - agora) if ativos else 1.0
+        for conn in wait(list(ativos), timeout=min(espera, 1.0)):
+            i, nome, _r = ativos[conn][1]
+            item = agregado[(i, nome)]
+            try:
+                msg = conn.recv()
+            except EOFError:
+                item["erro"] = "processo terminou sem resultado"
+                encerrar(conn, item["erro"])
+                continue
+            if msg[0] == "pronto":
+                tamanhos[i] = msg[1:]
+                ativos[conn][3] = time.monotonic() + timeout
+                ativos[conn][4] = True
+                continue
+            if msg[0] == "ok":
+                item["tempos"].append(msg[1])
+                if item["dist"] is None:
+                    item["dist"] = msg[2]
+                if msg[3] is not None:
+                    item["contagens"] = msg[3]
+                encerrar(conn, f"{msg[1]:.3f} ms")
+            elif msg[0] == "pulado":
+                item["pulado"] = True
+                encerrar(conn, "pulado")
+            else:
+                item["erro"] = msg[1]
+                encerrar(conn, f"erro: {msg[1]}")
+
+        agora = time.monotonic()
+        for conn, (proc, (i, nome, _r), _vaga, prazo, pronto) in list(ativos.items()):
+            if agora > prazo:
+                proc.kill()
+                agregado[(i, nome)]["timeouts"] += 1
+                encerrar(conn, "timed out" if pronto else "timed out (geração do grafo)")
+
+    linhas = []
+    for i, cenario in enumerate(cenarios):
+        n, m = tamanhos.get(i, (None, None))
+        referencia = None
+        for nome in algoritmos:
+            item = agregado[(i, nome)]
+            tempos = item["tempos"]
+            linha = {"cenario": cenario.nome, "algoritmo": nome, "V": n, "E": m}
+            if tempos:
+                if referencia is None:
+                    referencia = item["dist"]
+                    conferencia = "ok"
+                else:
+                    conferencia = "ok" if _mesmas_distancias(referencia, item["dist"]) else "DIVERGE"
+                linha.update(
+                    mediana_ms=statistics.median(tempos),
+                    p95_ms=_percentil(tempos, 0.95),
+                    desvio_ms=statistics.stdev(tempos) if len(tempos) > 1 else 0.0,
+                    medidas=len(tempos),
+                    distancias=conferencia,
+                )
+            else:
+                if item["pulado"]:
+                    situacao = "pulado"
+                elif item["erro"]:
+                    situacao = f"erro: {item['erro']}"
+                else:
+                    situacao = "timed out"
+                linha.update(mediana_ms=None, p95_ms=None, desvio_ms=None, medidas=0, distancias=situacao)
+            linha["timeouts"] = item["timeouts"]
+            if item["contagens"]:
+                linha.update(sorted(item["contagens"].items()))
+            linhas.append(linha)
+    return linhas
+
+
+def imprimir(linhas: List[dict]) -> None:
+    print(f"{'cenário':18s} {'algoritmo':20s} {'mediana':>10s} {'p95':>10s} {'desvio':>9s}  distâncias")
+    for l in linhas:
+        if l["mediana_ms"] is None:
+            print(f"{l['cenario']:18s} {l['algoritmo']:20s} {'-':>10s} {'-':>10s} {'-':>9s}  {l['distancias']}")
+        else:
+            print(f"{l['cenario']:18s} {l['algoritmo']:20s} {l['mediana_ms']:10.3f} {l['p95_ms']:10.3f} "
+                  f"{l['desvio_ms']:9.3f}  {l['distancias']}")
+
+
+def salvar_csv(linhas: List[dict], caminho: str) -> None:
+    # colunas = união das chaves (os contadores variam por algoritmo)
+    colunas = list(dict.fromkeys(chave for l in linhas for chave in l))
+    with open(caminho, "w", newline="") as f:
+        escritor = csv.DictWriter(f, fieldnames=colunas)
+        escritor.writeheader()
+        escritor.writerows(linhas)
+
+
+# ---------------------------------------------------------------------------
+# Baseline / regressões
+# ---------------------------------------------------------------------------
+def salvar_baseline(linhas: List[dict], caminho: str) -> None:
+    base = {f"{l['cenario']}/{l['algoritmo']}": l["mediana_ms"] for l in linhas if l["mediana_ms"] is not None}
+    with open(caminho, "w") as f:
+        json.dump(base, f, indent=2, sort_keys=True)
+
+
+def comparar_baseline(linhas: List[dict], caminho: str, tolerancia: float = 0.10) -> List[dict]:
+    """
+    Pares cuja mediana passou de baseline * (1 + tolerancia). Cada item traz
+    a mediana antiga, a nova e a razão nova/antiga.
+    """
+    with open(caminho) as f:
+        base = json.load(f)
+    regressoes = []
+    for l in linhas:
+        antiga = base.get(f"{l['cenario']}/{l['algoritmo']}")
+        if antiga is None or l["mediana_ms"] is None:
+            continue
+        if l["mediana_ms"] > antiga * (1 + tolerancia):
+            regressoes.append({
+                "cenario": l["cenario"],
+                "algoritmo": l["algoritmo"],
+                "baseline_ms": antiga,
+                "mediana_ms": l["mediana_ms"],
+                "razao": l["mediana_ms"] / antiga,
+            })
+    return regressoes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dos algoritmos de caminho mínimo")
+    parser.add_argument("--repeticoes", type=int, default=7)
+    parser.add_argument("--aquecimento", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--algoritmos", help="lista separada por vírgula (padrão: todos)")
+    parser.add_argument("--csv", help="grava as linhas em CSV")
+    parser.add_argument("--salvar-baseline", help="grava as medianas como baseline (JSON)")
+    parser.add_argument("--baseline", help="compara com um baseline salvo")
+    parser.add_argument("--tolerancia", type=float, default=0.10)
+    parser.add_argument("--isolado", action="store_true", help="um processo por rodada (rodar_isolado)")
+    parser.add_argument("--workers", type=int, help="processos simultâneos no modo isolado (padrão: núcleos)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="prazo por rodada no modo isolado (s)")
+    parser.add_argument("--timeout-geracao", type=float,
+                        help="prazo para gerar o grafo no modo isolado (s; padrão: --timeout)")
+    parser.add_argument("--contadores", action="store_true",
+                        help="acrescenta as contagens da instrumentação (use com --csv)")
+    args = parser.parse_args()
+
+    algoritmos = args.algoritmos.split(",") if args.algoritmos else None
+    if args.isolado:
+        linhas = rodar_isolado(algoritmos=algoritmos, repeticoes=args.repeticoes,
+                               aquecimento=args.aquecimento, seed=args.seed,
+                               workers=args.workers, timeout=args.timeout,
+                               contadores=args.contadores, timeout_geracao=args.timeout_geracao)
+    else:
+        linhas = rodar(algoritmos=algoritmos, repeticoes=args.repeticoes,
+                       aquecimento=args.aquecimento, seed=args.seed,
+                       contadores=args.contadores)
+    imprimir(linhas)
+    if args.csv:
+        salvar_csv(linhas, args.csv)
+    if args.salvar_baseline:
+        salvar_baseline(linhas, args.salvar_baseline)
+
+    falhou = any(l["distancias"] == "DIVERGE" for l in linhas)
+    if args.baseline:
+        regressoes = comparar_baseline(linhas, args.baseline, args.tolerancia)
+        for r in regressoes:
+            print(f"REGRESSÃO {r['cenario']}/{r['algoritmo']}: {r['baseline_ms']:.3f} -> "
+                  f"{r['mediana_ms']:.3f} ms ({r['razao']:.2f}x)")
+        falhou = falhou or bool(regressoes)
+    sys.exit(1 if falhou else 0)
@@ -0,0 +1,138 @@
+# cache_sssp.py
+# Cache de árvores de caminhos mínimos na frente dos algoritmos.
+#
+# Chave: (fingerprint do grafo, origem, algoritmo). O fingerprint é o hash do
+# conteúdo do CSRGraph (grafo_csr.py), recalculado só quando o grafo muda
+# (set_weight / touch): um grafo alterado nunca recebe resultado antigo.
+# Além disso, ao ver um grafo com fingerprint diferente do da última consulta,
+# o cache descarta na hora as entradas da versão anterior.
+#
+# Os resultados são guardados compactos (dist em array('d'), pred em
+# array('i'): 12 bytes por vértice) e o total fica limitado por max_bytes,
+# com descarte LRU (OrderedDict, como um functools.lru_cache com orçamento em
+# bytes em vez de número de entradas).
+
+from __future__ import annotations
+import weakref
+from array import array
+from collections import OrderedDict
+from typing import Tuple
+
+from bellman import bellman_ford_queue
+from dijkstra_artigo_corrigido import sssp_break_sorting_barrier
+from dijkstra_heap import dijkstra_heap
+from grafo_csr import CSRGraph
+
+
+def _dijkstra(g, s):
+    return dijkstra_heap(g, s)
+
+
+def _bmssp(g, s):
+    return sssp_break_sorting_barrier(g, s)
+
+
+def _spfa(g, s):
+    dis, pred, ciclo = bellman_ford_queue(g, g.n, g.num_edges, s)
+    if ciclo is not None:
+        raise ValueError(f"ciclo negativo alcançável a partir de {s}: {ciclo}")
+    return dis, pred
+
+
+# nome -> função (grafo CSR, origem) -> (dist, pred)
+ALGORITMOS = {
+    "dijkstra": _dijkstra,
+    "bmssp": _bmssp,
+    "spfa": _spfa,
+}
+
+
+class SSSPCache:
+    """
+    Cache LRU de (dist, pred) por (fingerprint, origem, algoritmo).
+    Os arrays devolvidos são os guardados no cache: não modificar.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entradas: "OrderedDict[tuple, Tuple[array, array]]" = OrderedDict()
+        # último fingerprint visto por grafo (sem manter o grafo vivo)
+        self._impressoes = weakref.WeakKeyDictionary()
+
+    def get(self, graph, src: int, algorithm: str = "dijkstra") -> Tuple[array, array]:
+        """
+        (dist, pred) de src, calculados por `algorithm` ou vindos do cache.
+        graph: CSRGraph (lista de adjacência é convertida a cada chamada).
+        """
+        if algorithm not in ALGORITMOS:
+            raise ValueError(f"algoritmo desconhecido: {algorithm!r} (opções: {sorted(ALGORITMOS)})")
+        g = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adj_list(graph)
+
+        impressao = g.fingerprint()
+        anterior = self._impressoes.get(g)
+        if anterior is not None and anterior != impressao:
+            self.invalidate(anterior)
+        self._impressoes[g] = impressao
+
+        chave = (impressao, src, algorithm)
+        resultado = self._entradas.get(chave)
+        if resultado is not None:
+            self._entradas.move_to_end(chave)
+            self.hits += 1
+            return resultado
+
+        self.misses += 1
+        dist, pred = ALGORITMOS[algorithm](g, src)
+        resultado = (array("d", dist), array("i", pred))
+        self._guardar(chave, resultado)
+        return resultado
+
+    def invalidate(self, fingerprint: str = None) -> None:
+        """
+        Remove as entradas de um fingerprint (ou todas, sem argumento).
+        """
+        if fingerprint is None:
+            self._entradas.clear()
+            self.bytes = 0
+            return
+        for chave in [c for c in self._entradas if c[0] == fingerprint]:
+            self.bytes -= _tamanho(self._entradas.pop(chave))
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def _guardar(self, chave, resultado) -> None:
+        tamanho = _tamanho(resultado)
+        if tamanho > self.max_bytes:
+            return
+        self._entradas[chave] = resultado
+        self.bytes += tamanho
+        while self.bytes > self.max_bytes:
+            _chave, antigo = self._entradas.popitem(last=False)
+            self.bytes -= _tamanho(antigo)
+
+
+def _tamanho(resultado) -> int:
+    dist, pred = resultado
+    return dist.itemsize * len(dist) + pred.itemsize * len(pred)
+
+
+if __name__ == "__main__":
+    adj_list = [
+        [(1, 4), (2, 2)],
+        [(2, 3), (3, 2), (4, 3)],
+        [(1, 1), (3, 4), (4, 5)],
+        [],
+        [(3, 1)],
+    ]
+    g = CSRGraph.from_adj_list(adj_list)
+    cache = SSSPCache(max_bytes=2 * 12 * len(g))  # cabem 2 árvores
+    for s in (0, 1, 0, 2, 0):
+        dist, _pred = cache.get(g, s)
+    print("hits:", cache.hits, "misses:", cache.misses, "entradas:", len(cache))
+
+    g.set_weight(0, 2, 10)  # muda o grafo: entradas antigas são descartadas
+    print("depois da mudança:", list(cache.get(g, 0)[0]), "entradas:", len(cache))
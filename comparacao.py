@@ -3,142 +3,46 @@ import random
 import sys
 import pandas as pd
 
-def dijkstra_matrix(graph, src):
-    """
-    Implementação do Dijkstra O(V^2) baseada no slide.
-    Entrada:
-        graph: Matriz de adjacência (Lista de listas) onde graph[u][v] é o peso.
-               0 indica ausência de aresta.
-        src: Vértice de origem (inteiro).
-    """
-    V = len(graph)
-    
-    # Inicialização (Linhas 3-8 do slide)
-    dist = [float('inf')] * V
-    sptSet = [False] * V # Shortest Path Tree Set
-    
-    dist[src] = 0
-    
-    # Loop principal (Linha 13)
-    for count in range(V - 1):
-        
-        # Encontrar o vértice de mínima distância que ainda não foi processado
-        # (Equivalente às linhas 16-20)
-        min_val = float('inf')
-        min_index = -1
-        
-        for v in range(V):
-            if not sptSet[v] and dist[v] <= min_val:
-                min_val = dist[v]
-                min_index = v
-        
-        # u é o vértice escolhido
-        u = min_index
-        
-        # Verificação de segurança (caso o grafo seja desconexo)
-        if u == -1:
-            break
-            
-        sptSet[u] = True # Linha 24
-        
-        # Atualizar distâncias dos vizinhos (Linhas 26-30)
-        for v in range(V):
-            # A condição verifica:
-            # 1. Se v não está no conjunto processado (!sptSet[v])
-            # 2. Se existe aresta entre u e v (graph[u][v])
-            # 3. Se a distância de u é válida (dist[u] != inf)
-            # 4. Se o novo caminho é menor
-            if (not sptSet[v] and 
-                graph[u][v] != 0 and 
-                dist[u] != float('inf') and 
-                dist[u] + graph[u][v] < dist[v]):
-                
-                dist[v] = dist[u] + graph[u][v]
-
-    # Impressão dos resultados (Linhas 33-34)
- #   print("Vértice \t Distância da Origem")
- #   for i in range(V):
-#      print(f"{i} \t\t {dist[i]}")
-        
-    return dist
-
-def bellman_ford_edgelist(graph_edges, V, E, src):
-    """
-    Implementação do Bellman-Ford baseada no slide.
-    Entrada:
-        graph_edges: Lista de arestas, onde cada item é [u, v, w].
-        V: Número de vértices.
-        E: Número de arestas.
-        src: Vértice de origem.
-    """
-    
-    # Inicialização (Linhas 3-7)
-    dis = [float('inf')] * V
-    dis[src] = 0
-    
-    # Relaxamento das arestas V-1 vezes (Linhas 9-15)
-    for i in range(V - 1):
-        for j in range(E):
-            u = graph_edges[j][0]
-            v = graph_edges[j][1]
-            w = graph_edges[j][2]
-            
-            # Verifica se podemos melhorar o caminho para v passando por u
-            if dis[u] != float('inf') and dis[u] + w < dis[v]:
-                dis[v] = dis[u] + w
-
-    # Verificação de Ciclo Negativo (Linhas 17-25)
-    for i in range(E):
-        x = graph_edges[i][0]
-        y = graph_edges[i][1]
-        weight = graph_edges[i][2]
-        
-        if dis[x] != float('inf') and dis[x] + weight < dis[y]:
-            print("Grafo contém ciclo de tamanho negativo")
-            return # Encerra se achar ciclo negativo
-
-    # Impressão dos resultados (Linhas 27-29)
-  #  print("Distância do vértice até a origem")
-  #  for i in range(V):
-   #     print(f"{i} \t\t {dis[i]}")
-        
-    return dis
-
-
-
+from dijkstra import dijkstra_dense, dijkstra_matrix, matriz_inf
+from bellman import bellman_ford_edgelist, bellman_ford_queue
+from dijkstra_heap import dijkstra_heap
+from grafo_csr import CSRGraph
+from geradores import gnp_pares
 from dijkstra_artigo_corrigido import sssp_break_sorting_barrier as dijA
-        
-
+from hierarquia_contracao import ContractionHierarchy
 
 
-
-
-
-def gerar_dados_teste(num_vertices, densidade):
+def gerar_dados_teste(num_vertices, densidade, com_matriz=True, seed=None):
     """
     Gera um grafo aleatório e retorna os formatos para Dijkstra (Matriz) e BF (Lista).
+    com_matriz=False evita alocar a matriz V x V (retorna None no lugar dela);
+    use CSRGraph.from_edges(V, arestas) para os algoritmos que aceitam CSR.
+    As arestas são sorteadas em O(E) por saltos geométricos (geradores.gnp_pares),
+    sem passar pelos V^2 pares; seed torna o grafo reprodutível.
+    Outras famílias (grade, geométrico, lei de potência, DAG): ver geradores.py.
     """
     max_peso = 10
-    matriz = [[0] * num_vertices for _ in range(num_vertices)]
+    rng = random.Random(seed) if seed is not None else random
+    matriz = [[0] * num_vertices for _ in range(num_vertices)] if com_matriz else None
     arestas = []
     
     num_arestas = 0
-    for u in range(num_vertices):
-        for v in range(num_vertices):
-            if u != v and random.random() < densidade:
-                peso = random.randint(1, max_peso)
-                matriz[u][v] = peso
-                arestas.append([u, v, peso])
-                num_arestas += 1
-                
+    for u, v in gnp_pares(num_vertices, densidade, rng):
+        peso = rng.randint(1, max_peso)
+        if com_matriz:
+            matriz[u][v] = peso
+        arestas.append([u, v, peso])
+        num_arestas += 1
+        
     return matriz, arestas, num_arestas
 
 
 def rodar_benchmark_completo():
-    print("Iniciando Benchmark Completo (3 Algoritmos)...")
+    print("Iniciando Benchmark Completo (8 Algoritmos)...")
     
     # Configurações
     NUM_RODADAS = 5 
+    NUM_CONSULTAS = 20  # consultas ponto a ponto por rodada (Hierarquia de Contração)
     cenarios = [
         # (Vértices, Densidade)
         (50, 0.2), 
@@ -174,34 +78,73 @@ def rodar_benchmark_completo():
             matriz, arestas, E = gerar_dados_teste(V, densidade)
             src = 0
             
-            # Converter para Lista de Adjacência (Necessário para o Dijkstra Faixas)
-            adj_list = [[] for _ in range(V)]
-            for u, v, w in arestas:
-                adj_list[u].append((v, w))
+            # Grafo compacto em CSR (aceito diretamente pelo algoritmo do artigo)
+            grafo = CSRGraph.from_edges(V, arestas)
             
             # --- Teste 1: Dijkstra Clássico (Matriz) ---
             start = time.perf_counter()
             dijkstra_matrix(matriz, src)
             t_classico = (time.perf_counter() - start) * 1000
 
+            # --- Teste 1b: Dijkstra denso vetorizado (NumPy, inf = sem aresta) ---
+            # A conversão da matriz fica fora da medida, como a montagem da matriz acima
+            W = matriz_inf(matriz)
+            start = time.perf_counter()
+            dijkstra_dense(W, src)
+            t_denso = (time.perf_counter() - start) * 1000
+
             # --- Teste 2: Bellman-Ford ---
             start = time.perf_counter()
             bellman_ford_edgelist(arestas, V, E, src)
             t_bf = (time.perf_counter() - start) * 1000
             
+            # --- Teste 2b: Bellman-Ford vetorizado (NumPy), mesma assinatura ---
+            start = time.perf_counter()
+            bellman_ford_edgelist(grafo, V, E, src, engine="numpy")
+            t_bf_np = (time.perf_counter() - start) * 1000
+            
+            # --- Teste 2c: Bellman-Ford com fila (SPFA) ---
+            start = time.perf_counter()
+            bellman_ford_queue(grafo, V, E, src)
+            t_spfa = (time.perf_counter() - start) * 1000
+            
             # --- Teste 3: Dijkstra Artigo (Faixas) ---
             # Definimos delta como uma média simples dos pesos (ex: 2 ou 5)
             start = time.perf_counter()
-            dijA(adj_list, 0)
+            dijA(grafo, 0)
             t_artigo = (time.perf_counter() - start) * 1000
             
+            # --- Teste 4: Dijkstra com Heap ---
+            start = time.perf_counter()
+            dijkstra_heap(grafo, src)
+            t_heap = (time.perf_counter() - start) * 1000
+            
+            # --- Teste 5: Hierarquia de Contração (pré-processa uma vez, consulta várias) ---
+            # Grafos aleatórios não têm hierarquia: grau_nucleo menor deixa o
+            # núcleo denso sem contrair, senão o pré-processamento domina o benchmark
+            start = time.perf_counter()
+            ch = ContractionHierarchy.build(grafo, grau_nucleo=12)
+            t_ch_pre = (time.perf_counter() - start) * 1000
+            
+            alvos = [random.randrange(V) for _ in range(NUM_CONSULTAS)]
+            start = time.perf_counter()
+            for alvo in alvos:
+                ch.query(src, alvo)
+            t_ch_consulta = (time.perf_counter() - start) * 1000 / NUM_CONSULTAS
+            
             resultados_brutos.append({
                 "Vértices": V,
                 "Densidade": densidade,
                 "Arestas": E,
                 "Dijkstra Clássico (ms)": t_classico,
+                "Dijkstra NumPy (ms)": t_denso,
                 "Artigo (ms)": t_artigo,
                 "Bellman-Ford (ms)": t_bf,
+                "Bellman-Ford NumPy (ms)": t_bf_np,
+                "Bellman-Ford SPFA (ms)": t_spfa,
+                "Dijkstra Heap (ms)": t_heap,
+                "CH Pré-processamento (ms)": t_ch_pre,
+                "CH Consulta (ms)": t_ch_consulta,
             })
 
     # Criar DataFrame e Média
@@ -209,7 +152,7 @@ def rodar_benchmark_completo():
     df_final = df.groupby(["Vértices", "Densidade"]).mean(numeric_only=True).reset_index()
     
     # Remover colunas desnecessárias para visualização limpa
-    cols = ["Vértices", "Densidade", "Arestas", "Dijkstra Clássico (ms)", "Artigo (ms)", "Bellman-Ford (ms)" ]
+    cols = ["Vértices", "Densidade", "Arestas", "Dijkstra Clássico (ms)", "Dijkstra NumPy (ms)", "Artigo (ms)", "Bellman-Ford (ms)", "Bellman-Ford NumPy (ms)", "Bellman-Ford SPFA (ms)", "Dijkstra Heap (ms)", "CH Pré-processamento (ms)", "CH Consulta (ms)" ]
     print("\n" + "="*80)
     print("RESULTADOS FINAIS - MÉDIA DE TEMPO")
     print("="*80)
@@ -217,11 +160,12 @@ def rodar_benchmark_completo():
     
     return df, df_final
 
-# Para rodar:
-df3, df4 = rodar_benchmark_completo()
+if __name__ == "__main__":
+    # Para rodar:
+    df3, df4 = rodar_benchmark_completo()
 
-print(df3)
-print("= " * 10)
-print(df4)
-df3.to_csv("resultados_brutos.csv", index=False)
-df4.to_csv("resultados_media.csv", index=False)
\ No newline at end of file
+    print(df3)
+    print("= " * 10)
+    print(df4)
+    df3.to_csv("resultados_brutos.csv", index=False)
+    df4.to_csv("resultados_media.csv", index=False)
@@ -0,0 +1,269 @@
+# despacho.py
+# Porta de entrada única: shortest_paths(graph, src) escolhe o algoritmo.
+#
+# Não há um vencedor geral (ver resultados_media.csv): o Dijkstra de matriz
+# ganha em grafos pequenos e densos, o do artigo em grafos grandes e esparsos,
+# e só as variantes de Bellman-Ford aceitam pesos negativos. Aqui:
+#   - as estatísticas do grafo (n, m, densidade, sinal e integralidade dos
+#     pesos) são calculadas uma vez e ficam em cache no próprio CSRGraph
+#     (CSRGraph.stats(), descartadas a cada mudança de peso);
+#   - cada motor faz a mesma chamada que o algoritmo de mesmo nome no registro
+#     do benchmark.py, para que a calibração meça o que de fato roda aqui;
+#   - pesos negativos restringem a escolha aos motores que os aceitam, e o
+#     max_n de cada motor tira os O(V^2) dos grafos grandes; o dijkstra_dense guarda a matriz_inf de cada grafo (por
+#     versão), então só a primeira consulta paga a conversão;
+#   - o padrão é dijkstra_heap (ou spfa, com pesos negativos). Só se troca de
+#     motor com base em um ponto de calibração com V até JANELA_V vezes maior
+#     ou menor que o do grafo e que tenha medido o padrão: entre esses, vale o
+#     mais próximo (distância em log2 V e log2 densidade, mais 1 se a
+#     integralidade dos pesos diferir) e, nele, o motor permitido mais rápido.
+#     Fora da faixa calibrada, ou sem o padrão medido, fica o padrão.
+#
+# Calibração: pontos (V, densidade, tempo de cada motor) tirados da saída dos
+# benchmarks, não de limiares fixos no código, lidos de ARQUIVO_CALIBRACAO
+# (gravado por `python despacho.py --csv ...`). Aceita tanto o CSV do
+# comparacao.py (uma coluna "<Algoritmo> (ms)" por algoritmo) quanto o do
+# benchmark.py --csv (uma linha por cenário/algoritmo). O resultados_media.csv
+# do repositório não é lido por padrão: só mede três motores e a coluna do
+# Artigo é da versão antiga do BMSSP.
+#
+# Uso:
+#   python benchmark.py --csv medidas.csv
+#   python despacho.py --csv medidas.csv
+
+from __future__ import annotations
+import argparse
+import csv
+import importlib.util
+import json
+import math
+import os
+import weakref
+from typing import Dict, List, Optional
+
+from bellman import bellman_ford_edgelist, bellman_ford_queue
+from dijkstra import dijkstra_dense, dijkstra_matrix, matriz_inf
+from dijkstra_artigo import dijkstra_simplified_bands
+from dijkstra_artigo_corrigido import sssp_break_sorting_barrier
+from dijkstra_heap import dijkstra_heap
+from grafo_csr import CSRGraph
+
+_PASTA = os.path.dirname(os.path.abspath(__file__))
+ARQUIVO_CALIBRACAO = os.path.join(_PASTA, "despacho_calibracao.json")
+
+# pontos de calibração valem para grafos com V até este fator maior ou menor
+JANELA_V = 2.0
+
+
+# grafo -> (versão, matriz_inf): o dijkstra_dense não remonta a matriz V x V
+# a cada consulta no mesmo grafo (sem manter o grafo vivo)
+_matrizes = weakref.WeakKeyDictionary()
+
+
+def _matriz_inf(g):
+    em_cache = _matrizes.get(g)
+    if em_cache is None or em_cache[0] != g.version:
+        em_cache = _matrizes[g] = (g.version, matriz_inf(g))
+    return em_cache[1]
+
+
+def _spfa(g, s):
+    dis, _pred, ciclo = bellman_ford_queue(g, g.n, g.num_edges, s)
+    return None if ciclo is not None else dis
+
+
+# nome (o mesmo do registro do benchmark.py, com a mesma chamada) ->
+# (função(grafo CSR, origem) -> distâncias ou None se houver ciclo negativo,
+#  aceita pesos negativos, maior n aceito ou None)
+MOTORES = {
+    "dijkstra_heap": (lambda g, s: dijkstra_heap(g, s)[0], False, None),
+    "artigo": (lambda g, s: sssp_break_sorting_barrier(g, s)[0], False, None),
+    "artigo_ajustado": (lambda g, s: sssp_break_sorting_barrier(g, s, tuned=True)[0], False, None),
+    "delta_stepping": (lambda g, s: dijkstra_simplified_bands(g, g.n, s), False, None),
+    "dijkstra_matrix_csr": (lambda g, s: dijkstra_matrix(g, s), False, 2000),
+    "dijkstra_dense": (lambda g, s: dijkstra_dense(_matriz_inf(g), s), False, 5000),
+    "bellman_ford_csr": (lambda g, s: bellman_ford_edgelist(g, g.n, g.num_edges, s), True, 5000),
+    "bellman_ford_numpy": (lambda g, s: bellman_ford_edgelist(g, g.n, g.num_edges, s, engine="numpy"), True, None),
+    "spfa": (_spfa, True, None),
+}
+if importlib.util.find_spec("numpy") is None:
+    del MOTORES["bellman_ford_numpy"]
+    del MOTORES["dijkstra_dense"]
+
+# colunas do CSV do comparacao.py -> motor. Ficam de fora "Dijkstra Clássico"
+# e "Bellman-Ford": lá rodam sobre a matriz e a lista de arestas, não sobre o CSR
+COLUNAS_COMPARACAO = {
+    "Dijkstra NumPy (ms)": "dijkstra_dense",
+    "Artigo (ms)": "artigo",
+    "Bellman-Ford NumPy (ms)": "bellman_ford_numpy",
+    "Bellman-Ford SPFA (ms)": "spfa",
+    "Dijkstra Heap (ms)": "dijkstra_heap",
+}
+
+
+# ---------------------------------------------------------------------------
+# Calibração
+# ---------------------------------------------------------------------------
+def _numero(x) -> Optional[float]:
+    if x is None or x == "":
+        return None
+    x = float(x)
+    return None if math.isnan(x) else x
+
+
+def calibrar(linhas: List[dict]) -> List[dict]:
+    """
+    Pontos de calibração a partir de linhas de benchmark (dicts, como as de
+    benchmark.rodar() ou as do csv.DictReader sobre qualquer um dos dois CSVs).
+    Cada ponto: {"V", "densidade", "inteiros" (ou None), "tempos": {motor: ms}}.
+    """
+    pontos: Dict[tuple, dict] = {}
+    for l in linhas:
+        if "algoritmo" in l:
+            # benchmark.py: uma linha por (cenário, algoritmo)
+            nome = l["algoritmo"]
+            ms = _numero(l.get("mediana_ms"))
+            if nome not in MOTORES or ms is None or l.get("distancias") != "ok":
+                continue
+            V, E = int(float(l["V"])), _numero(l["E"])
+            chave = (l["cenario"], V, E)
+            densidade = E / (V * (V - 1)) if V > 1 else 0.0
+            inteiros = l.get("inteiros")
+            tempos = {nome: ms}
+        else:
+            # comparacao.py: uma linha por (V, densidade), pesos inteiros
+            V, densidade = int(float(l["Vértices"])), _numero(l["Densidade"])
+            chave = ("comparacao", V, densidade)
+            inteiros = True
+            tempos = {}
+            for coluna, nome in COLUNAS_COMPARACAO.items():
+                ms = _numero(l.get(coluna))
+                if nome in MOTORES and ms is not None:
+                    tempos[nome] = ms
+        if isinstance(inteiros, str):
+            inteiros = inteiros == "True"
+        ponto = pontos.setdefault(chave, {"V": V, "densidade": densidade, "inteiros": inteiros, "tempos": {}})
+        ponto["tempos"].update(tempos)
+    return [p for p in pontos.values() if p["tempos"]]
+
+
+def calibrar_csv(*caminhos: str) -> List[dict]:
+    linhas = []
+    for caminho in caminhos:
+        with open(caminho, newline="") as f:
+            linhas.extend(csv.DictReader(f))
+    return calibrar(linhas)
+
+
+def salvar_calibracao(pontos: List[dict], caminho: str = ARQUIVO_CALIBRACAO) -> None:
+    with open(caminho, "w") as f:
+        json.dump(pontos, f, indent=2, sort_keys=True)
+
+
+# caminho -> (mtime, pontos): o arquivo é relido só quando muda
+_cache_calibracao: Dict[str, tuple] = {}
+
+
+def carregar_calibracao(caminho: str = ARQUIVO_CALIBRACAO) -> List[dict]:
+    """
+    Pontos gravados por salvar_calibracao(); lista vazia se o arquivo não existe.
+    """
+    try:
+        mtime = os.path.getmtime(caminho)
+    except OSError:
+        return []
+    em_cache = _cache_calibracao.get(caminho)
+    if em_cache is None or em_cache[0] != mtime:
+        with open(caminho) as f:
+            pontos = json.load(f)
+        em_cache = _cache_calibracao[caminho] = (mtime, pontos)
+    return em_cache[1]
+
+
+# ---------------------------------------------------------------------------
+# Escolha e execução
+# ---------------------------------------------------------------------------
+def _distancia(stats: dict, ponto: dict) -> float:
+    d = abs(math.log2(max(stats["n"], 1)) - math.log2(max(ponto["V"], 1)))
+    d += abs(math.log2(max(stats["densidade"], 1e-12)) - math.log2(max(ponto["densidade"], 1e-12)))
+    if ponto.get("inteiros") is not None and ponto["inteiros"] != stats["inteiros"]:
+        d += 1.0
+    return d
+
+
+def _permitidos(stats: dict) -> set:
+    permitidos = set()
+    for nome, (_f, negativos, max_n) in MOTORES.items():
+        if stats["negativos"] and not negativos:
+            continue
+        if max_n is not None and stats["n"] > max_n:
+            continue
+        permitidos.add(nome)
+    return permitidos
+
+
+def escolher_algoritmo(graph, calibracao: Optional[List[dict]] = None) -> str:
+    """
+    Nome do motor (chave de MOTORES) que shortest_paths usaria para graph.
+    calibracao: pontos de calibrar(); None usa carregar_calibracao().
+    """
+    g = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adj_list(graph)
+    stats = g.stats()
+    padrao = "spfa" if stats["negativos"] else "dijkstra_heap"
+    permitidos = _permitidos(stats)
+    pontos = carregar_calibracao() if calibracao is None else calibracao
+    janela = math.log2(JANELA_V)
+
+    melhor = None
+    for ponto in pontos:
+        if abs(math.log2(max(stats["n"], 1)) - math.log2(max(ponto["V"], 1))) > janela:
+            continue
+        # sem o padrão medido no ponto, não há com o que comparar os outros
+        if padrao not in ponto["tempos"]:
+            continue
+        d = _distancia(stats, ponto)
+        if melhor is None or d < melhor[0]:
+            melhor = (d, ponto)
+    if melhor is None:
+        return padrao
+    tempos = {nome: ms for nome, ms in melhor[1]["tempos"].items() if nome in permitidos}
+    return min(tempos, key=tempos.get)
+
+
+def shortest_paths(graph, src: int, calibracao: Optional[List[dict]] = None):
+    """
+    Distâncias a partir de src, pelo motor mais rápido (segundo a calibração)
+    entre os corretos para graph.
+    graph: CSRGraph (estatísticas ficam em cache nele) ou lista de adjacência
+    (convertida a cada chamada).
+    ValueError se houver ciclo negativo alcançável a partir de src.
+    """
+    g = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adj_list(graph)
+    f, _negativos, _max_n = MOTORES[escolher_algoritmo(g, calibracao)]
+    dist = f(g, src)
+    if dist is None:
+        raise ValueError(f"ciclo negativo alcançável a partir de {src}")
+    return dist
+
+
+if __name__ == "__main__":
+    from geradores import dag_negativo, gnp
+
+    parser = argparse.ArgumentParser(description="Calibração do despacho de shortest_paths")
+    parser.add_argument("--csv", nargs="+", help="CSVs do benchmark.py ou do comparacao.py")
+    parser.add_argument("--arquivo", default=ARQUIVO_CALIBRACAO)
+    args = parser.parse_args()
+
+    if args.csv:
+        pontos = calibrar_csv(*args.csv)
+        salvar_calibracao(pontos, args.arquivo)
+        print(f"{len(pontos)} pontos de calibração -> {args.arquivo}")
+    else:
+        pontos = carregar_calibracao()
+
+    for nome, g in [
+        ("gnp 100, denso", gnp(100, 0.8, seed=1)),
+        ("gnp 2000, esparso", gnp(2000, 5 / 2000, seed=1)),
+        ("dag 500, pesos negativos", dag_negativo(500, 0.02, seed=1)),
+    ]:
+        print(f"{nome:26s} -> {escolher_algoritmo(g, pontos)}")
@@ -1,14 +1,22 @@
 import sys
 
+import instrumentacao
+from grafo_csr import CSRGraph
+
 def dijkstra_matrix(graph, src):
     """
     Implementação do Dijkstra O(V^2) baseada no slide.
     Entrada:
         graph: Matriz de adjacência (Lista de listas) onde graph[u][v] é o peso.
                0 indica ausência de aresta.
+               Também aceita um CSRGraph: a busca do mínimo continua O(V),
+               mas o relaxamento percorre só os vizinhos de u.
         src: Vértice de origem (inteiro).
+    Contadores (instrumentacao.py): varreduras (busca do mínimo), expansoes,
+    relaxacoes (posições da linha, ou arestas no CSR) e melhorias.
     """
     V = len(graph)
+    csr = isinstance(graph, CSRGraph)
     
     # Inicialização (Linhas 3-8 do slide)
     dist = [float('inf')] * V
@@ -16,8 +24,20 @@ def dijkstra_matrix(graph, src):
     
     dist[src] = 0
     
+    c = instrumentacao.ativos
+    if c is not None:
+        if csr:
+            graph = instrumentacao.GrafoContado(graph, c)
+        dist = instrumentacao.EscritasContadas(dist, c)
+    
     # Loop principal (Linha 13)
     for count in range(V - 1):
+        if c is not None:
+            # uma vez por iteração, fora dos laços de O(V)
+            c["varreduras"] += V
+            if not csr:
+                c["expansoes"] += 1
+                c["relaxacoes"] += V
         
         # Encontrar o vértice de mínima distância que ainda não foi processado
         # (Equivalente às linhas 16-20)
@@ -38,6 +58,14 @@ def dijkstra_matrix(graph, src):
             
         sptSet[u] = True # Linha 24
         
+        if csr:
+            # Mesmo relaxamento das linhas 26-30, só que sobre as arestas de u
+            du = dist[u]
+            for v, w in graph[u]:
+                if not sptSet[v] and du + w < dist[v]:
+                    dist[v] = du + w
+            continue
+        
         # Atualizar distâncias dos vizinhos (Linhas 26-30)
         for v in range(V):
             # A condição verifica:
@@ -52,39 +80,125 @@ def dijkstra_matrix(graph, src):
                 
                 dist[v] = dist[u] + graph[u][v]
 
+    if c is not None:
+        dist = dist.dados
+    return dist
+
+def matriz_inf(graph):
+    """
+    Matriz de pesos NumPy (float64) com inf onde não há aresta.
+    Entrada:
+        graph: CSRGraph (arestas de peso 0 são preservadas; entre arestas
+               paralelas fica a menor) ou matriz de adjacência em lista de
+               listas, em que 0 indica ausência de aresta (como em dijkstra_matrix).
+    """
+    import numpy as np
+    
+    if isinstance(graph, CSRGraph):
+        W = np.full((graph.n, graph.n), np.inf)
+        us = np.asarray(graph.edge_sources(), dtype=np.int64)
+        vs = np.asarray(graph.targets, dtype=np.int64)
+        np.minimum.at(W, (us, vs), np.asarray(graph.weights, dtype=np.float64))
+        return W
+    W = np.array(graph, dtype=np.float64)
+    W[W == 0] = np.inf
+    return W
+
+def dijkstra_dense(W, src):
+    """
+    O mesmo Dijkstra O(V^2) de dijkstra_matrix, com os dois laços internos
+    vetorizados em NumPy:
+      - busca do mínimo: argmin sobre as distâncias provisórias, em que os
+        vértices já fechados valem inf (máscara);
+      - relaxamento: minimum(chave, dist[u] + W[u] + penalidade) na linha
+        inteira, com penalidade inf nos vértices fechados (assim eles
+        continuam inf na chave) e tudo em buffers pré-alocados.
+    Sobra um laço Python de V iterações, cada uma com O(1) chamadas NumPy.
+    Entrada:
+        W: matriz V x V de pesos >= 0 com inf onde não há aresta (matriz_inf).
+        src: vértice de origem.
+    Retorna dist (numpy.ndarray float64).
+    Contadores (instrumentacao.py): os mesmos de dijkstra_matrix, com
+    relaxacoes contando só as arestas (peso finito) para vértices abertos.
+    """
+    import numpy as np
+    
+    W = np.asarray(W, dtype=np.float64)
+    V = W.shape[0]
+    if V and W.min() < 0:
+        raise ValueError("dijkstra_dense exige pesos >= 0 (use bellman_ford_edgelist)")
+    
+    inf = np.inf
+    dist = np.full(V, inf)
+    chave = np.full(V, inf)  # distâncias provisórias; inf nos fechados
+    chave[src] = 0.0
+    penalidade = np.zeros(V)  # 0 nos abertos, inf nos fechados
+    linha = np.empty(V)
+    argmin = np.argmin
+    add = np.add
+    minimum = np.minimum
+    c = instrumentacao.ativos
+    
+    for _ in range(V):
+        u = int(argmin(chave))
+        du = chave[u]
+        if c is not None:
+            c["varreduras"] += V
+        if du == inf:
+            break  # o resto não é alcançável
+        dist[u] = du
+        chave[u] = inf
+        penalidade[u] = inf
+        add(W[u], penalidade, out=linha)
+        linha += du
+        if c is not None:
+            # uma vez por vértice fechado, em cima da linha já montada
+            c["expansoes"] += 1
+            c["relaxacoes"] += int(np.count_nonzero(linha < inf))
+            c["melhorias"] += int(np.count_nonzero(linha < chave))
+        minimum(chave, linha, out=chave)
+    
+    return dist
+
+def imprimir_distancias(dist):
     # Impressão dos resultados (Linhas 33-34)
     print("Vértice \t Distância da Origem")
-    for i in range(V):
+    for i in range(len(dist)):
         print(f"{i} \t\t {dist[i]}")
-        
-    return dist
 
-# Configuração do Grafo da imagem 2 para Dijkstra
-# Matriz 5x5 inicializada com 0
-V_dijk = 5
-graph_dijk = [[0 for _ in range(V_dijk)] for _ in range(V_dijk)]
+if __name__ == "__main__":
+    # Configuração do Grafo da imagem 2 para Dijkstra
+    # Matriz 5x5 inicializada com 0
+    V_dijk = 5
+    graph_dijk = [[0 for _ in range(V_dijk)] for _ in range(V_dijk)]
+
+    # Preenchendo a matriz de adjacência (graph[u][v] = peso)
+    # Indices ajustados (1 vira 0, etc.)
+
+    # Arestas saindo do 1 (0)
+    graph_dijk[0][1] = 4  # 1 -> 2
+    graph_dijk[0][2] = 2  # 1 -> 3
 
-# Preenchendo a matriz de adjacência (graph[u][v] = peso)
-# Indices ajustados (1 vira 0, etc.)
+    # Arestas saindo do 2 (1)
+    graph_dijk[1][2] = 3  # 2 -> 3
+    graph_dijk[1][3] = 2  # 2 -> 4
+    graph_dijk[1][4] = 3  # 2 -> 5
 
-# Arestas saindo do 1 (0)
-graph_dijk[0][1] = 4  # 1 -> 2
-graph_dijk[0][2] = 2  # 1 -> 3
+    # Arestas saindo do 3 (2)
+    graph_dijk[2][1] = 1  # 3 -> 2
+    graph_dijk[2][3] = 4  # 3 -> 4
+    graph_dijk[2][4] = 5  # 3 -> 5
 
-# Arestas saindo do 2 (1)
-graph_dijk[1][2] = 3  # 2 -> 3
-graph_dijk[1][3] = 2  # 2 -> 4
-graph_dijk[1][4] = 3  # 2 -> 5
+    # Arestas saindo do 4 (3)
 
-# Arestas saindo do 3 (2)
-graph_dijk[2][1] = 1  # 3 -> 2
-graph_dijk[2][3] = 4  # 3 -> 4
-graph_dijk[2][4] = 5  # 3 -> 5
+    # Arestas saindo do 5 (4)
+    graph_dijk[4][3] = 1  # 5 -> 4
 
-# Arestas saindo do 4 (3)
+    print("\n--- Teste Dijkstra ---")
+    imprimir_distancias(dijkstra_matrix(graph_dijk, 0))
 
-# Arestas saindo do 5 (4)
-graph_dijk[4][3] = 1  # 5 -> 4
+    print("\n--- Teste Dijkstra (CSR) ---")
+    imprimir_distancias(dijkstra_matrix(CSRGraph.from_matrix(graph_dijk), 0))
 
-print("\n--- Teste Dijkstra ---")
-dijkstra_matrix(graph_dijk, 0)
\ No newline at end of file
+    print("\n--- Teste Dijkstra (NumPy, matriz com inf) ---")
+    imprimir_distancias(list(dijkstra_dense(matriz_inf(graph_dijk), 0)))
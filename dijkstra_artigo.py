@@ -1,78 +1,268 @@
 import math
+import multiprocessing
+from array import array
 
-def dijkstra_simplified_bands(adj_list, V, src, delta=2):
+import instrumentacao
+from grafo_csr import CSRGraph, close_shared, share_array, attach_array
+
+def escolher_delta(adj_list, V):
+    """
+    Delta automático a partir da distribuição de pesos: max_w / grau médio
+    (o Θ(1/d) de Meyer & Sanders para pesos uniformes). Com isso cada balde
+    recebe, em média, O(1) relaxamentos de arestas leves por vértice.
+    """
+    if isinstance(adj_list, CSRGraph):
+        pesos = adj_list.weights
+    else:
+        pesos = [w for vizinhos in adj_list for _v, w in vizinhos]
+    if len(pesos) == 0:
+        return 1.0
+    max_w = max(pesos)
+    grau_medio = len(pesos) / max(1, V)
+    delta = max_w / max(1.0, grau_medio)
+    return delta if delta > 0 else 1.0
+
+def dijkstra_simplified_bands(adj_list, V, src, delta=None, workers=1, min_lote=1024):
     """
-    Versão Corrigida: Remove o return prematuro.
+    Delta-stepping (Meyer & Sanders) com baldes ("faixas") de largura delta.
+    adj_list: adj_list[u] = list[(v, w)] ou um CSRGraph (mesma interface), w >= 0.
+    delta: largura das faixas (> 0); None escolhe automaticamente (escolher_delta).
+    workers: > 1 usa o modo multiprocesso (dijkstra_bands_parallel).
+    
+    - Arestas leves (w <= delta) podem cair no próprio balde: são relaxadas em
+      fases repetidas até o balde esvaziar.
+    - Arestas pesadas (w > delta) sempre caem em baldes à frente: são relaxadas
+      uma única vez, depois que o balde foi fechado.
+    - Baldes em array circular de tamanho max_w // delta + 2: todas as
+      distâncias pendentes ficam em [i*delta, i*delta + max_w], então os
+      índices não colidem, e o próximo balde não vazio é achado em no máximo
+      uma volta (o fim é quando a volta inteira está vazia).
+    Contadores (instrumentacao.py, só no modo sequencial): relaxacoes,
+    melhorias, baldes_varridos, baldes, fases_leves e expansoes.
     """
+    if delta is not None and delta <= 0:
+        raise ValueError("delta deve ser > 0")
+    if workers > 1:
+        return dijkstra_bands_parallel(adj_list, V, src, delta, workers, min_lote)
+    if delta is None:
+        delta = escolher_delta(adj_list, V)
+    if isinstance(adj_list, CSRGraph):
+        max_w = max(adj_list.weights) if adj_list.num_edges else 0
+    else:
+        max_w = max((w for vizinhos in adj_list for _v, w in vizinhos), default=0)
+    
     dist = [float('inf')] * V
     dist[src] = 0
     
-    buckets = {} 
-    buckets[0] = {src}
+    nb = int(max_w // delta) + 2
+    buckets = [set() for _ in range(nb)]
+    buckets[0].add(src)
     
-    current_bucket_idx = 0
-    max_dist_seen = 0
+    def relax(v, nd):
+        # Move v para o balde da nova distância
+        if nd < dist[v]:
+            if dist[v] != float('inf'):
+                buckets[int(dist[v] // delta) % nb].discard(v)
+            dist[v] = nd
+            buckets[int(nd // delta) % nb].add(v)
+    
+    c = instrumentacao.ativos
+    if c is not None:
+        relax_simples = relax
+        
+        def relax(v, nd):
+            c["relaxacoes"] += 1
+            if nd < dist[v]:
+                c["melhorias"] += 1
+            relax_simples(v, nd)
     
+    i = 0  # índice absoluto do balde atual
     while True:
-        # 1. Encontrar o próximo balde não vazio
-        while current_bucket_idx not in buckets or not buckets[current_bucket_idx]:
-            current_bucket_idx += 1
-            
-            # Condição de Parada: Se passamos da maior distância vista e não tem mais nada
-            if current_bucket_idx * delta > max_dist_seen:
-                is_empty = True
-                for k in buckets:
-                    if k >= current_bucket_idx and buckets[k]:
-                        is_empty = False; break
-                if is_empty: 
-                    return dist # <--- O ÚNICO RETURN DEVE SER AQUI (ou na checagem de segurança)
-            
-            # Break de segurança para loops infinitos em grafos desconexos/estranhos
-            if current_bucket_idx > V * 100 + max_dist_seen: 
-                 return dist 
+        # 1. Encontrar o próximo balde não vazio (no máximo uma volta)
+        i0 = i
+        for _ in range(nb):
+            if buckets[i % nb]:
+                break
+            i += 1
+        else:
+            if c is not None:
+                c["baldes_varridos"] += nb
+            return dist
         
-        # 2. Processar a "Faixa" (Bucket) atual
-        # Enquanto houver vértices neste balde, processa
-        while buckets.get(current_bucket_idx):
-            u = buckets[current_bucket_idx].pop() 
-            
-            for v, weight in adj_list[u]:
-                new_dist = dist[u] + weight
-                
-                if new_dist < dist[v]:
-                    dist[v] = new_dist
-                    max_dist_seen = max(max_dist_seen, new_dist)
-                    
-                    new_bucket_idx = int(new_dist // delta)
-                    
-                    if new_bucket_idx not in buckets:
-                        buckets[new_bucket_idx] = set()
-                    
-                    buckets[new_bucket_idx].add(v)
+        if c is not None:
+            c["baldes_varridos"] += i - i0 + 1
+            c["baldes"] += 1
+        balde = buckets[i % nb]
+        fechados = []
+        
+        # 2. Fases leves: repete enquanto o balde receber vértices de volta
+        while balde:
+            atuais = list(balde)
+            balde.clear()
+            fechados.extend(atuais)
+            if c is not None:
+                c["fases_leves"] += 1
+                c["expansoes"] += len(atuais)
+            for u in atuais:
+                du = dist[u]
+                for v, w in adj_list[u]:
+                    if w <= delta:
+                        relax(v, du + w)
         
-        # REMOVIDO O RETURN DIST QUE ESTAVA AQUI
+        # 3. Arestas pesadas, uma vez por vértice fechado neste balde
+        for u in set(fechados):
+            du = dist[u]
+            for v, w in adj_list[u]:
+                if w > delta:
+                    relax(v, du + w)
+        
+        i += 1
+    
+# ---------------------------------------------------------------------------
+# Modo paralelo: relaxamento síncrono por balde em um pool de processos
+# ---------------------------------------------------------------------------
+# Estado de cada worker, montado uma vez no initializer: o CSR e o vetor de
+# distâncias em memória compartilhada (nada disso é serializado por fase).
+_worker = {}
+
+def _init_worker_bandas(meta, nome_dist):
+    g, blocos = CSRGraph.attach_shared(meta)
+    blocos.append(attach_array(nome_dist, 'd', meta["n"]))
+    _worker["g"] = g
+    _worker["dist"] = blocos[-1][1]
+    _worker["blocos"] = blocos
+
+def _requisicoes(offsets, targets, weights, dist, vertices, leves, delta):
+    """
+    Gera as requisições de relaxamento de um lote de vértices: para cada v
+    alcançado, a menor distância nova que melhora dist[v] (só leitura de dist).
+    leves=True considera w <= delta, leves=False considera w > delta.
+    """
+    melhor = {}
+    for u in vertices:
+        du = dist[u]
+        for j in range(offsets[u], offsets[u + 1]):
+            w = weights[j]
+            if (w <= delta) == leves:
+                v = targets[j]
+                nd = du + w
+                if nd < dist[v] and nd < melhor.get(v, math.inf):
+                    melhor[v] = nd
+    return array('i', melhor.keys()), array('d', melhor.values())
+
+def _requisicoes_worker(tarefa):
+    vertices, leves, delta = tarefa
+    g = _worker["g"]
+    return _requisicoes(g.offsets, g.targets, g.weights, _worker["dist"], vertices, leves, delta)
+
+def dijkstra_bands_parallel(adj_list, V, src, delta=None, workers=None, min_lote=1024):
+    """
+    Mesmo delta-stepping de dijkstra_simplified_bands, com cada fase (leve ou
+    pesada) de um balde dividida entre `workers` processos.
+    
+    - O grafo (convertido para CSR, se preciso) e o vetor de distâncias ficam
+      em memória compartilhada; cada fase envia só a lista de vértices.
+    - Os workers só leem dist e devolvem requisições (v, nova distância), já
+      reduzidas ao mínimo por v; o processo principal junta as requisições e
+      aplica os relaxamentos (único escritor, sem corrida entre fases).
+    - Fases com menos de min_lote vértices rodam no próprio processo: o custo
+      de IPC só compensa em baldes grandes.
+    Retorna dist (lista), como a versão sequencial.
+    """
+    if delta is not None and delta <= 0:
+        raise ValueError("delta deve ser > 0")
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    g = adj_list if isinstance(adj_list, CSRGraph) else CSRGraph.from_adj_list(adj_list)
+    if delta is None:
+        delta = escolher_delta(g, V)
+    max_w = max(g.weights) if g.num_edges else 0
+    
+    g_comp, meta, blocos = g.to_shared()
+    blocos.append(share_array('d', None, V))
+    dist = blocos[-1][1]
+    inf = float('inf')
+    for v in range(V):
+        dist[v] = inf
+    dist[src] = 0
+    
+    nb = int(max_w // delta) + 2
+    buckets = [set() for _ in range(nb)]
+    buckets[0].add(src)
+    
+    def relax(v, nd):
+        if nd < dist[v]:
+            if dist[v] != inf:
+                buckets[int(dist[v] // delta) % nb].discard(v)
+            dist[v] = nd
+            buckets[int(nd // delta) % nb].add(v)
+    
+    def fase(pool, vertices, leves):
+        if len(vertices) < min_lote:
+            resultados = [_requisicoes(g.offsets, g.targets, g.weights, dist, vertices, leves, delta)]
+        else:
+            passo = -(-len(vertices) // workers)
+            lotes = [(vertices[k:k + passo], leves, delta) for k in range(0, len(vertices), passo)]
+            resultados = pool.map(_requisicoes_worker, lotes)
+        for alvos, novas in resultados:
+            for v, nd in zip(alvos, novas):
+                relax(v, nd)
     
-# --- Cole aqui a função dijkstra_simplified_bands que já implementamos ---
-# (Se precisar dela novamente, me avise que eu reenvio)
+    pool = multiprocessing.Pool(workers, _init_worker_bandas, (meta, blocos[-1][0].name))
+    try:
+        i = 0
+        while True:
+            for _ in range(nb):
+                if buckets[i % nb]:
+                    break
+                i += 1
+            else:
+                break
+            
+            balde = buckets[i % nb]
+            fechados = set()
+            while balde:
+                atuais = array('i', balde)
+                balde.clear()
+                fechados.update(atuais)
+                fase(pool, atuais, True)
+            fase(pool, array('i', fechados), False)
+            i += 1
+        
+        return list(dist)
+    finally:
+        pool.terminate()
+        pool.join()
+        del dist, g_comp
+        close_shared(blocos, unlink=True)
+
+if __name__ == "__main__":
+    # --- Cole aqui a função dijkstra_simplified_bands que já implementamos ---
+    # (Se precisar dela novamente, me avise que eu reenvio)
+
+    # 1. Montar a Lista de Adjacência (Entrada)
+    V = 5
+    src = 0 # Origem (Vértice 1)
 
-# 1. Montar a Lista de Adjacência (Entrada)
-V = 5
-src = 0 # Origem (Vértice 1)
+    adj_list = [
+        [(1, 4), (2, 2)],          # Vizinhos do 0 (1)
+        [(2, 3), (3, 2), (4, 3)],  # Vizinhos do 1 (2)
+        [(1, 1), (3, 4), (4, 5)],  # Vizinhos do 2 (3)
+        [],                        # Vizinhos do 3 (4) - Sem saída
+        [(3, 1)]                   # Vizinhos do 4 (5)
+    ]
 
-adj_list = [
-    [(1, 4), (2, 2)],          # Vizinhos do 0 (1)
-    [(2, 3), (3, 2), (4, 3)],  # Vizinhos do 1 (2)
-    [(1, 1), (3, 4), (4, 5)],  # Vizinhos do 2 (3)
-    [],                        # Vizinhos do 3 (4) - Sem saída
-    [(3, 1)]                   # Vizinhos do 4 (5)
-]
+    # 2. Executar o Algoritmo
+    # Sem delta: escolhido a partir dos pesos (max_w / grau médio)
+    print("delta automático:", escolher_delta(adj_list, V))
+    distancias = dijkstra_simplified_bands(adj_list, V, src)
 
-# 2. Executar o Algoritmo
-# Delta=2 é um bom valor para pesos pequenos (1 a 5) como os seus
-distancias = dijkstra_simplified_bands(adj_list, V, src, delta=2)
+    # 3. Mostrar Resultado
+    print("--- Resultado Dijkstra Faixas ---")
+    print("Vértice \t Distância Mínima")
+    for i, d in enumerate(distancias):
+        print(f"{i+1} \t\t {d}")
 
-# 3. Mostrar Resultado
-print("--- Resultado Dijkstra Faixas ---")
-print("Vértice \t Distância Mínima")
-for i, d in enumerate(distancias):
-    print(f"{i+1} \t\t {d}")
\ No newline at end of file
+    # 4. Modo paralelo (min_lote=1 só para forçar o uso do pool neste grafo minúsculo)
+    paralelo = dijkstra_simplified_bands(adj_list, V, src, workers=2, min_lote=1)
+    print("Paralelo igual ao sequencial:", paralelo == distancias)
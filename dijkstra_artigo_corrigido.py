@@ -2,19 +2,78 @@
 # Implementa os Algoritmos 1, 2 e 3 de "Breaking the Sorting Barrier for Directed SSSP"
 # (arXiv:2504.17033v2, Jul 2025) de forma fiel na lógica.
 #
-# Observação: o Lema 3.3 (estrutura parcial) é implementado aqui via heapq (prático),
-# preservando a interface, mas não o tempo assintótico da prova.
+# Observação: o Lema 3.3 (estrutura parcial) tem duas implementações com a mesma
+# interface, escolhidas por `frontier=` em sssp_break_sorting_barrier:
+#   - "heap":   FrontierDS, via heapq (prático), sem o tempo assintótico da prova.
+#               É o padrão e o usado pelo benchmark.py, despacho.py e demais.
+#   - "blocks": BlockFrontierDS, a lista ligada de blocos do paper (D0/D1,
+#               blocos de tamanho M, split pela mediana, BatchPrepend e Pull em lote).
+#               Fica como referência da prova: em Python é mais lento que o
+#               "heap" (gnp n=20000, grau ~10: ~0.48 s contra ~0.37 s), pois o
+#               split e o pull em lote custam mais que as operações do heapq.
 #
-# Grafo: adj[u] = list[(v, w)] com w >= 0 (pesos reais ou floats).
+# Nenhuma das duas ganha do dijkstra_heap (~0.17 s no mesmo grafo): em Python
+# o custo constante da recursão, do find_pivots e do Pull domina o ganho
+# assintótico; o algoritmo fica aqui pela fidelidade ao paper.
+#
+# Desempate (Suposição 2.1 do paper): o paper supõe comprimentos de caminho
+# distintos. Com pesos inteiros há muitos empates, e o Pull deixa de conseguir
+# separar S do resto (x == valor de algum elemento de S), perdendo vértices;
+# com arestas de peso 0 o filho pode até ficar "antes" do pai e a recursão
+# não avança. Seguindo o paper, o caminho é comparado pela tupla
+# (comprimento, nº de arestas, vértice): o relaxamento usa (db, hops) e os
+# valores em D e todos os limites (B, B', x) são triplas (db[v], hops[v], v).
+# É uma ordem total, consistente com db, em que o pai vem sempre antes do filho.
+#
+# Grafo: adj[u] = list[(v, w)] com w >= 0 (pesos reais ou floats),
+# ou um CSRGraph (grafo_csr.py), que expõe a mesma interface len(adj) / adj[u].
+#
+# Modo grande (10^6 vértices, 10^7 arestas):
+#   passe um CSRGraph em vez da lista de tuplas (12 B por aresta + 8 B por
+#   vértice, contra ~100 B por tupla (v, w)). O estado por vértice é alocado
+#   uma vez, em arrays tipados de tamanho fixo:
+#     db (8 B), hops (4 B), pred_parent (4 B), pred_w (8 B) e os carimbos de
+#     W / W_i / U / tamanho de subárvore ((3 + l_top) * 4 B, ver _Marks),
+#   ~ 50 B por vértice. Além disso, só as estruturas do Lema 3.3 crescem, com
+#   no máximo uma entrada viva por vértice em cada nível (~ 150 B cada).
+#   Para n = 10^6, m = 10^7: ~ 130 MB de grafo + ~ 50 MB de estado fixo.
+#   Não há recursão proporcional ao grafo: o find_pivots calcula as
+#   subárvores sem DFS recursiva e a recursão do bmssp tem profundidade
+#   l_top (3 para n = 10^6), então o limite de recursão do Python não importa.
+#
+# Contadores (instrumentacao.py): bmssp_nivel_<l>, pull / pull_itens,
+# find_pivots / find_pivots_cedo, base_case / base_case_vertices, e
+# expansoes / relaxacoes / melhorias via grafo e pred_parent embrulhados em
+# sssp_break_sorting_barrier. Só há checagens por chamada, nunca por aresta.
+#
+# Parâmetros k, t, l_top: por padrão os da prova (_calc_params), que para n
+# prático dão constantes pequenas e não necessariamente as mais rápidas em
+# Python. sssp_break_sorting_barrier aceita k/t/l_top explícitos ou, com
+# tuned=True, os melhores medidos por ajuste_bmssp.py para a classe de tamanho
+# de n (gravados em ARQUIVO_PARAMETROS).
 
 from __future__ import annotations
+import json
 import math
 import heapq
+import os
+from array import array
+from bisect import bisect_left
 from dataclasses import dataclass
 from typing import Dict, List, Tuple, Set, Iterable, Optional
 
+import instrumentacao
+
 INF = float("inf")
 
+# Limite/valor em D: tripla (distância, nº de arestas, vértice)
+Bound = Tuple[float, int, int]
+INF_BOUND: Bound = (INF, 0, 0)
+
+
+# Sentinela de "sem predecessor" nos arrays de pred (mesma do dijkstra_heap)
+NO_PRED = -1
+
 
 @dataclass
 class PredInfo:
@@ -22,6 +81,16 @@ class PredInfo:
     w: float = 0.0  # peso da aresta (parent -> v) que gerou o db[v]
 
 
+def pred_info(pred_parent: array, pred_w: array, v: int) -> PredInfo:
+    """
+    Visão PredInfo de um vértice a partir dos arrays de predecessor.
+    """
+    p = pred_parent[v]
+    if p == NO_PRED:
+        return PredInfo(None, 0.0)
+    return PredInfo(p, pred_w[v])
+
+
 class FrontierDS:
     """
     Interface do Lema 3.3:
@@ -30,15 +99,18 @@ class FrontierDS:
       - BatchPrepend(pairs)   (no paper: todos menores que qualquer valor presente)
       - Pull() -> (x, S)      (S com <= M chaves de menor valor, x separa o resto)
     Implementação prática com heapq + best-value por chave (lazy deletion).
+    Os values são Bounds (db, hops, v): ordem total, o heap nunca tem empate.
+    Como o último campo do value é a própria chave, o heap guarda só o value
+    (uma tupla por entrada, em vez de (value, key)).
     """
 
     def __init__(self):
         self.M = 1
-        self.B = INF
-        self.best: Dict[int, float] = {}
-        self.heap: List[Tuple[float, int]] = []
+        self.B: Bound = INF_BOUND
+        self.best: Dict[int, Bound] = {}
+        self.heap: List[Bound] = []
 
-    def initialize(self, M: int, B: float):
+    def initialize(self, M: int, B: Bound):
         self.M = max(1, int(M))
         self.B = B
         self.best.clear()
@@ -48,20 +120,20 @@ class FrontierDS:
         self._cleanup_top()
         return len(self.heap) == 0
 
-    def insert(self, key: int, value: float):
+    def insert(self, key: int, value: Bound):
         # Mantém o menor valor por chave
-        cur = self.best.get(key, INF)
+        cur = self.best.get(key, INF_BOUND)
         if value < cur:
             self.best[key] = value
-            heapq.heappush(self.heap, (value, key))
+            heapq.heappush(self.heap, value)
 
-    def batch_prepend(self, pairs: Iterable[Tuple[int, float]]):
+    def batch_prepend(self, pairs: Iterable[Tuple[int, Bound]]):
         # No paper, esses values são menores que qualquer value já presente.
         # Aqui, a gente só faz "insert" normal; corretude permanece.
         for k, v in pairs:
             self.insert(k, v)
 
-    def pull(self) -> Tuple[float, Set[int]]:
+    def pull(self) -> Tuple[Bound, Set[int]]:
         """
         Retorna:
           - x: bound separador (B se vazio, ou o menor value restante após remover S)
@@ -71,9 +143,10 @@ class FrontierDS:
         self._cleanup_top()
 
         while len(S) < self.M and self.heap:
-            val, key = heapq.heappop(self.heap)
+            val = heapq.heappop(self.heap)
+            key = val[2]
             # lazy deletion: ignora se não é mais o melhor
-            if self.best.get(key, INF) != val:
+            if self.best.get(key) != val:
                 continue
             # remove do "ativo" ao puxar
             del self.best[key]
@@ -83,17 +156,228 @@ class FrontierDS:
         if not self.heap:
             x = self.B
         else:
-            x = self.heap[0][0]
+            x = self.heap[0]
         return x, S
 
     def _cleanup_top(self):
         while self.heap:
-            val, key = self.heap[0]
-            if self.best.get(key, INF) == val:
+            val = self.heap[0]
+            if self.best.get(val[2]) == val:
                 break
             heapq.heappop(self.heap)
 
 
+class _Block:
+    """
+    Bloco da lista ligada do Lema 3.3: dicionário key -> value (inserção e
+    remoção O(1)) e, para blocos de D1, o limite superior `ub` dos pares do bloco.
+    """
+
+    __slots__ = ("items", "ub")
+
+    def __init__(self, items: Optional[Dict[int, Bound]] = None, ub: Optional[Bound] = None):
+        self.items: Dict[int, Bound] = items if items is not None else {}
+        self.ub = ub
+
+
+class BlockFrontierDS:
+    """
+    Estrutura do Lema 3.3 como no paper:
+      - D0: sequência de blocos vindos de BatchPrepend (sempre menores que o resto).
+      - D1: sequência de blocos vindos de Insert, ordenada pelos limites superiores
+            (busca do bloco por bisect sobre a lista de limites, no lugar da BST).
+      - cada bloco tem no máximo M pares; em D1 um bloco que passa de M é
+        dividido pela mediana.
+      - BatchPrepend(L): |L| <= M vira um bloco; senão L é cortado em blocos
+        de ceil(M/2), em ordem, e colocado na frente de D0.
+      - Pull: junta os blocos da frente de D0 e de D1 até ter >= M pares em
+        cada um (ou acabarem), separa os M menores e devolve o menor restante.
+    Cada chave fica em um único bloco (where[key]); um valor menor para a
+    mesma chave remove o par antigo.
+    A mediana/seleção usa sort (C) sobre O(M) pares, no lugar da seleção
+    linear da prova.
+    """
+
+    def __init__(self):
+        self.M = 1
+        self.B: Bound = INF_BOUND
+        self.where: Dict[int, _Block] = {}
+        self.d0: List[_Block] = []        # pilha: o fim da lista é a frente de D0
+        self.d1: List[_Block] = []        # em ordem crescente de ub
+        self.d1_ubs: List[Bound] = []
+
+    def initialize(self, M: int, B: Bound):
+        self.M = max(1, int(M))
+        self.B = B
+        self.where.clear()
+        self.d0.clear()
+        self.d1 = [_Block(ub=B)]
+        self.d1_ubs = [B]
+
+    def is_empty(self) -> bool:
+        return not self.where
+
+    def _discard(self, key: int, value: Bound) -> bool:
+        """
+        Remove o par antigo da chave se o novo valor for menor.
+        Retorna False se o par existente já é melhor (nada a fazer).
+        """
+        blk = self.where.get(key)
+        if blk is None:
+            return True
+        if blk.items[key] <= value:
+            return False
+        del blk.items[key]
+        del self.where[key]
+        return True
+
+    def insert(self, key: int, value: Bound):
+        if not self._discard(key, value):
+            return
+        i = bisect_left(self.d1_ubs, value)
+        if i == len(self.d1):
+            # último bloco foi esvaziado e descartado em um Pull: recria com ub = B
+            self.d1.append(_Block(ub=self.B))
+            self.d1_ubs.append(self.B)
+            i = len(self.d1) - 1
+        blk = self.d1[i]
+        blk.items[key] = value
+        self.where[key] = blk
+        if len(blk.items) > self.M:
+            self._split(i)
+
+    def _split(self, i: int):
+        # Divide o bloco i de D1 pela mediana: metade menor vira um bloco novo
+        # antes dele, com ub = maior par da metade menor.
+        blk = self.d1[i]
+        pairs = sorted((v, k) for k, v in blk.items.items())
+        half = len(pairs) // 2
+        low = _Block({k: v for v, k in pairs[:half]}, ub=pairs[half - 1][0])
+        blk.items = {k: v for v, k in pairs[half:]}
+        for k in low.items:
+            self.where[k] = low
+        self.d1.insert(i, low)
+        self.d1_ubs.insert(i, low.ub)
+
+    def batch_prepend(self, pairs: Iterable[Tuple[int, Bound]]):
+        # Mantém só o menor valor de cada chave (na lista e contra o que já está em D)
+        best: Dict[int, Bound] = {}
+        for k, v in pairs:
+            if v < best.get(k, INF_BOUND):
+                best[k] = v
+        L = [(v, k) for k, v in best.items() if self._discard(k, v)]
+        if not L:
+            return
+        if len(L) <= self.M:
+            self._push_d0(L)
+            return
+        L.sort()
+        step = max(1, (self.M + 1) // 2)
+        # blocos do maior para o menor: o último empilhado fica na frente
+        for a in range(((len(L) - 1) // step) * step, -1, -step):
+            self._push_d0(L[a:a + step])
+
+    def _push_d0(self, L: List[Tuple[Bound, int]]):
+        blk = _Block({k: v for v, k in L})
+        for k in blk.items:
+            self.where[k] = blk
+        self.d0.append(blk)
+
+    def pull(self) -> Tuple[Bound, Set[int]]:
+        """
+        Retorna:
+          - x: bound separador (B se vazio, ou o menor value restante após remover S)
+          - S: conjunto com <= M chaves de menor valor
+        """
+        M = self.M
+        # blocos vazios (esvaziados por _discard/Pull) saem aqui
+        while self.d0 and not self.d0[-1].items:
+            self.d0.pop()
+        j = 0
+        while j < len(self.d1) and not self.d1[j].items:
+            j += 1
+        if j:
+            del self.d1[:j]
+            del self.d1_ubs[:j]
+
+        # prefixo de D0 com >= M pares
+        cand: List[Tuple[Bound, int]] = []
+        cnt = 0
+        i0 = len(self.d0)
+        while i0 > 0 and cnt < M:
+            i0 -= 1
+            items = self.d0[i0].items
+            cnt += len(items)
+            cand.extend((v, k) for k, v in items.items())
+        # prefixo de D1 com >= M pares
+        cnt = 0
+        i1 = 0
+        while i1 < len(self.d1) and cnt < M:
+            items = self.d1[i1].items
+            cnt += len(items)
+            cand.extend((v, k) for k, v in items.items())
+            i1 += 1
+
+        if len(cand) <= M and len(cand) == len(self.where):
+            # tudo cabe em S: D fica vazio
+            S = {k for _v, k in cand}
+            self.where.clear()
+            self.d0.clear()
+            self.d1 = [_Block(ub=self.B)]
+            self.d1_ubs = [self.B]
+            return self.B, S
+
+        cand.sort()
+        S: Set[int] = set()
+        for _v, k in cand[:M]:
+            del self.where[k].items[k]
+            del self.where[k]
+            S.add(k)
+
+        # x = menor par restante: o próximo candidato ou o mínimo dos
+        # primeiros blocos ainda não examinados de D0/D1
+        x = cand[M][0] if len(cand) > M else self.B
+        while i0 > 0 and not self.d0[i0 - 1].items:
+            i0 -= 1
+        if i0 > 0:
+            x = min(x, min(self.d0[i0 - 1].items.values()))
+        while i1 < len(self.d1) and not self.d1[i1].items:
+            i1 += 1
+        if i1 < len(self.d1):
+            x = min(x, min(self.d1[i1].items.values()))
+        return x, S
+
+
+FRONTIERS = {
+    "heap": FrontierDS,
+    "blocks": BlockFrontierDS,
+}
+
+
+class _Marks:
+    """
+    Carimbos (epoch) para pertinência em W, W_i e U sem montar sets:
+    v pertence ao conjunto da chamada atual se mark[v] == epoch da chamada.
+      - w, wi, size: usados só dentro de um find_pivots (que não é recursivo)
+      - u[l]: um array por nível, pois as chamadas de bmssp ativas formam uma
+        cadeia com no máximo uma por nível
+    Memória fixa: (3 + l_top) * 4 bytes por vértice.
+    """
+
+    __slots__ = ("w", "wi", "size", "u", "epoch")
+
+    def __init__(self, n: int, l_top: int):
+        self.w = array("i", bytes(4 * n))
+        self.wi = array("i", bytes(4 * n))
+        self.size = array("i", bytes(4 * n))
+        self.u = [None] + [array("i", bytes(4 * n)) for _ in range(l_top)]
+        self.epoch = 0
+
+    def next_epoch(self) -> int:
+        self.epoch += 1
+        return self.epoch
+
+
 def _calc_params(n: int) -> Tuple[int, int, int]:
     """
     Paper usa:
@@ -118,206 +402,331 @@ def _pow2(exp: int) -> int:
     return 1 << exp
 
 
+# Parâmetros ajustados por classe de tamanho (escrito por ajuste_bmssp.py)
+ARQUIVO_PARAMETROS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bmssp_parametros.json")
+
+
+def profundidade_minima(n: int, k: int, t: int) -> int:
+    """
+    Menor l_top com k^2 * 2^{l_top * t} >= n. Abaixo disso o laço do nível
+    de cima pode parar pelo limite de |U| antes de esvaziar D, deixando
+    distâncias sem fechar; o l_top do paper sempre satisfaz isso.
+    """
+    l = 1
+    while k * k * _pow2(l * t) < n:
+        l += 1
+    return l
+
+
+def classe_tamanho(n: int) -> str:
+    # classes em potências de 2: "2^11" cobre 2048 <= n < 4096
+    return f"2^{max(0, n.bit_length() - 1)}"
+
+
+def parametros_ajustados(n: int, caminho: str = ARQUIVO_PARAMETROS) -> Optional[Tuple[int, int, int]]:
+    """
+    (k, t, l_top) gravados para a classe de tamanho de n, ou None se não
+    houver ajuste. Se o ajuste rodou numa amostra menor que n, o l_top
+    gravado pode não bastar para n: é elevado a profundidade_minima(n, k, t).
+    """
+    try:
+        with open(caminho) as f:
+            tabela = json.load(f)
+    except FileNotFoundError:
+        return None
+    item = tabela.get(classe_tamanho(n))
+    if item is None:
+        return None
+    k, t = item["k"], item["t"]
+    return k, t, max(item["l_top"], profundidade_minima(n, k, t))
+
+
 def base_case(
-    B: float,
+    B: Bound,
     S: Set[int],
     adj: List[List[Tuple[int, float]]],
-    db: List[float],
-    pred: List[PredInfo],
+    db: array,
+    hops: array,
+    pred_parent: array,
+    pred_w: array,
     k: int,
-) -> Tuple[float, Set[int]]:
+) -> Tuple[Bound, Set[int]]:
     """
     Algoritmo 2 (BaseCase).
     Requisitos do paper: S={x}, x completo, etc.
     Aqui assumimos S singleton.
     """
+    c = instrumentacao.ativos
+    if c is not None:
+        c["base_case"] += 1
     (x,) = tuple(S)
-    U0: Set[int] = {x}
-    heap: List[Tuple[float, int]] = [(db[x], x)]
-    in_heap: Dict[int, float] = {x: db[x]}
+    U0: Set[int] = set()
+    heap: List[Bound] = [(db[x], hops[x], x)]
 
     while heap and len(U0) < k + 1:
-        du, u = heapq.heappop(heap)
-        if in_heap.get(u, INF) != du:
+        du, hu, u = heapq.heappop(heap)
+        # lazy deletion: entrada obsoleta ou u já extraído
+        if u in U0 or du != db[u] or hu != hops[u]:
             continue
-        del in_heap[u]
         U0.add(u)
 
+        hu1 = hu + 1
         for v, w in adj[u]:
             nd = du + w
-            if nd <= db[v] and nd < B:
-                db[v] = nd
-                pred[v].parent = u
-                pred[v].w = w
-                # decrease-key lazy
-                if nd < in_heap.get(v, INF):
-                    in_heap[v] = nd
-                    heapq.heappush(heap, (nd, v))
-
+            dv = db[v]
+            # (nd, hu+1) <= (db[v], hops[v]) e (nd, hu+1, v) < B
+            if nd < dv or (nd == dv and hu1 <= hops[v]):
+                key = (nd, hu1, v)
+                if key < B:
+                    db[v] = nd
+                    hops[v] = hu1
+                    pred_parent[v] = u
+                    pred_w[v] = w
+                    # decrease-key lazy
+                    if v not in U0:
+                        heapq.heappush(heap, key)
+
+    if c is not None:
+        c["base_case_vertices"] += len(U0)
     if len(U0) <= k:
         return B, U0
     else:
-        # B' = max_{v in U0} db[v], U = {v in U0 : db[v] < B'}
-        Bp = max(db[v] for v in U0)
-        U = {v for v in U0 if db[v] < Bp}
+        # B' = max_{v in U0} (db[v], hops[v], v), U = {v in U0 : (db[v], hops[v], v) < B'}
+        Bp = max((db[v], hops[v], v) for v in U0)
+        U = {v for v in U0 if (db[v], hops[v], v) < Bp}
         return Bp, U
 
 
 def find_pivots(
-    B: float,
+    B: Bound,
     S: Set[int],
     adj: List[List[Tuple[int, float]]],
-    db: List[float],
-    pred: List[PredInfo],
+    db: array,
+    hops: array,
+    pred_parent: array,
+    pred_w: array,
     k: int,
-) -> Tuple[Set[int], Set[int]]:
+    marks: _Marks,
+) -> Tuple[Set[int], List[int]]:
     """
     Algoritmo 1 (FindPivots) conforme paper.
-    Retorna (P, W).
+    Retorna (P, W), com W em lista: a pertinência a W e a W_i é feita por
+    carimbo (marks.w / marks.wi), sem montar sets a cada rodada.
     """
-    W: Set[int] = set(S)
-    Wi_prev: Set[int] = set(S)
+    c = instrumentacao.ativos
+    if c is not None:
+        c["find_pivots"] += 1
+    wmark = marks.w
+    wimark = marks.wi
+    ew = marks.next_epoch()
+    W: List[int] = list(S)
+    for u in W:
+        wmark[u] = ew
+    Wi_prev: List[int] = W[:]
+    limit = k * len(S)
 
     for _i in range(1, k + 1):
-        Wi: Set[int] = set()
+        ei = marks.next_epoch()
+        Wi: List[int] = []
         for u in Wi_prev:
             du = db[u]
+            hu1 = hops[u] + 1
             for v, w in adj[u]:
                 nd = du + w
-                if nd <= db[v]:
+                dv = db[v]
+                if nd < dv or (nd == dv and hu1 <= hops[v]):
                     db[v] = nd
-                    pred[v].parent = u
-                    pred[v].w = w
-                    if nd < B:
-                        Wi.add(v)
-        W |= Wi
+                    hops[v] = hu1
+                    pred_parent[v] = u
+                    pred_w[v] = w
+                    if (nd, hu1, v) < B and wimark[v] != ei:
+                        wimark[v] = ei
+                        Wi.append(v)
+                        if wmark[v] != ew:
+                            wmark[v] = ew
+                            W.append(v)
         Wi_prev = Wi
 
-        if len(W) > k * len(S):
+        if len(W) > limit:
             # paper: P <- S e retorna
+            if c is not None:
+                c["find_pivots_cedo"] += 1
             return set(S), W
 
     # Construir F = {(u,v) em E : u,v in W e db[v] = db[u] + wuv}
-    # Usamos o pred global: se pred[v] = u e ambos em W e igualdade bate, então (u,v) entra.
-    children: Dict[int, List[int]] = {u: [] for u in W}
-    indeg: Dict[int, int] = {u: 0 for u in W}
-
+    # Usamos o pred global: se pred_parent[v] = u e ambos em W e igualdade bate, então (u,v) entra.
+    # Tamanho das subárvores sem recursão: toda aresta de F aumenta hops em 1
+    # (o que também garante que F é uma floresta mesmo com arestas de peso 0),
+    # então percorrer W por hops decrescente soma cada filho antes do seu pai.
+    size = marks.size
     for v in W:
-        u = pred[v].parent
-        if u is None:
+        size[v] = 1
+    for v in sorted(W, key=hops.__getitem__, reverse=True):
+        u = pred_parent[v]
+        if u == NO_PRED or wmark[u] != ew:
             continue
-        if u in W and v in W:
-            # checa igualdade via w armazenado
-            if abs(db[v] - (db[u] + pred[v].w)) <= 0.0:
-                children.setdefault(u, []).append(v)
-                indeg[v] = indeg.get(v, 0) + 1
-
-    # roots do "forest" = nós com indeg 0 dentro de W
-    roots = [u for u in W if indeg.get(u, 0) == 0]
-
-    # calcular tamanhos de subárvore
-    subtree_size: Dict[int, int] = {}
-
-    def dfs(u: int) -> int:
-        s = 1
-        for ch in children.get(u, []):
-            s += dfs(ch)
-        subtree_size[u] = s
-        return s
+        # checa igualdade via w armazenado
+        if db[v] == db[u] + pred_w[v] and hops[v] == hops[u] + 1:
+            size[u] += size[v]
 
-    for r in roots:
-        dfs(r)
-
-    P = {u for u in S if subtree_size.get(u, 1) >= k}
+    P = {u for u in S if size[u] >= k}
     return P, W
 
 
 def bmssp(
     l: int,
-    B: float,
+    B: Bound,
     S: Set[int],
     adj: List[List[Tuple[int, float]]],
-    db: List[float],
-    pred: List[PredInfo],
+    db: array,
+    hops: array,
+    pred_parent: array,
+    pred_w: array,
     k: int,
     t: int,
-) -> Tuple[float, Set[int]]:
+    frontier,
+    marks: _Marks,
+) -> Tuple[Bound, Iterable[int]]:
     """
     Algoritmo 3 (BMSSP) do paper.
+    frontier: classe da estrutura do Lema 3.3 (FrontierDS ou BlockFrontierDS).
+    U é devolvido em lista; a união U ∪ U_i é deduplicada pelo carimbo do
+    nível l (marks.u[l]), já que no máximo uma chamada por nível está ativa.
     """
+    c = instrumentacao.ativos
+    if c is not None:
+        c[f"bmssp_nivel_{l}"] += 1
     if l == 0:
-        return base_case(B, S, adj, db, pred, k)
+        return base_case(B, S, adj, db, hops, pred_parent, pred_w, k)
 
-    P, W = find_pivots(B, S, adj, db, pred, k)
+    P, W = find_pivots(B, S, adj, db, hops, pred_parent, pred_w, k, marks)
 
-    D = FrontierDS()
+    D = frontier()
     M = _pow2((l - 1) * t)  # 2^{(l-1)t}
     D.initialize(M, B)
 
     for x in P:
-        D.insert(x, db[x])
+        D.insert(x, (db[x], hops[x], x))
 
     i = 0
     if P:
-        Bp_i = min(db[x] for x in P)
+        Bp_i = min((db[x], hops[x], x) for x in P)
     else:
         Bp_i = B
-    U: Set[int] = set()
+    U: List[int] = []
+    umark = marks.u[l]
+    eu = marks.next_epoch()
 
     limit = (k * k) * _pow2(l * t)  # k^2 * 2^{lt}
 
     while len(U) < limit and (not D.is_empty()):
         i += 1
         Bi, Si = D.pull()  # (B_i, S_i)
-        Bp_i, Ui = bmssp(l - 1, Bi, Si, adj, db, pred, k, t)
-        U |= Ui
+        if c is not None:
+            c["pull"] += 1
+            c["pull_itens"] += len(Si)
+        Bp_i, Ui = bmssp(l - 1, Bi, Si, adj, db, hops, pred_parent, pred_w, k, t, frontier, marks)
+        for u in Ui:
+            if umark[u] != eu:
+                umark[u] = eu
+                U.append(u)
 
-        K_pairs: List[Tuple[int, float]] = []
+        K_pairs: List[Tuple[int, Bound]] = []
         for u in Ui:
             du = db[u]
+            hu1 = hops[u] + 1
             for v, w in adj[u]:
                 nd = du + w
-                if nd <= db[v]:
+                dv = db[v]
+                if nd < dv or (nd == dv and hu1 <= hops[v]):
                     db[v] = nd
-                    pred[v].parent = u
-                    pred[v].w = w
-                    if Bi <= nd < B:
-                        D.insert(v, nd)
-                    elif Bp_i <= nd < Bi:
-                        K_pairs.append((v, nd))
+                    hops[v] = hu1
+                    pred_parent[v] = u
+                    pred_w[v] = w
+                    key = (nd, hu1, v)
+                    if Bi <= key < B:
+                        D.insert(v, key)
+                    elif Bp_i <= key < Bi:
+                        K_pairs.append((v, key))
 
         # BatchPrepend(K ∪ {⟨x, db[x]⟩ : x ∈ Si and db[x] ∈ [B′i, Bi)})
-        extra = [(x, db[x]) for x in Si if (Bp_i <= db[x] < Bi)]
-        D.batch_prepend(K_pairs + extra)
+        for x in Si:
+            key = (db[x], hops[x], x)
+            if Bp_i <= key < Bi:
+                K_pairs.append((x, key))
+        D.batch_prepend(K_pairs)
 
     Bp = min(Bp_i, B)
-    U |= {x for x in W if db[x] < Bp}
+    for x in W:
+        if umark[x] != eu and (db[x], hops[x], x) < Bp:
+            umark[x] = eu
+            U.append(x)
     return Bp, U
 
 
 def sssp_break_sorting_barrier(
     adj: List[List[Tuple[int, float]]],
     s: int,
-) -> Tuple[List[float], List[Optional[int]]]:
+    frontier: str = "heap",
+    with_weights: bool = False,
+    k: Optional[int] = None,
+    t: Optional[int] = None,
+    l_top: Optional[int] = None,
+    tuned: bool = False,
+):
     """
     Executa o algoritmo do paper:
       chama BMSSP com l=ceil((log n)/t), S={s}, B=inf.
+    frontier: "heap" (FrontierDS, padrão) ou "blocks" (BlockFrontierDS,
+      Lema 3.3; fiel à prova, mas mais lento que "heap" em Python).
+    k, t, l_top: parâmetros explícitos; os omitidos vêm do ajuste (tuned=True,
+      se houver um para a classe de tamanho de n) ou do paper (_calc_params).
+      Sem l_top explícito, usa ao menos profundidade_minima(n, k, t); um l_top
+      explícito abaixo disso é ValueError (o resultado ficaria incompleto).
+    Todo o estado por vértice fica em arrays de tamanho fixo (ver "Modo grande"
+    no topo do arquivo); para grafos grandes, passe um CSRGraph.
     Retorna:
-      - distâncias finais (db)
-      - predecessor (Pred) para reconstruir caminhos
+      - distâncias finais (db): array float64
+      - predecessor (Pred) para reconstruir caminhos: array int32, -1 = sem pai
+      - com with_weights=True, também pred_w (peso da aresta pai -> v);
+        pred_info(pred_parent, pred_w, v) monta a visão PredInfo de um vértice
     """
     n = len(adj)
-    k, t, l_top = _calc_params(n)
-
-    db = [INF] * n
-    pred = [PredInfo(None, 0.0) for _ in range(n)]
+    padrao = (parametros_ajustados(n) if tuned else None) or _calc_params(n)
+    explicito = l_top is not None
+    k = padrao[0] if k is None else k
+    t = padrao[1] if t is None else t
+    l_top = padrao[2] if l_top is None else l_top
+    if k < 1 or t < 1 or l_top < 1:
+        raise ValueError(f"parâmetros devem ser >= 1 (k={k}, t={t}, l_top={l_top})")
+    minimo = profundidade_minima(n, k, t)
+    if l_top < minimo:
+        if explicito:
+            raise ValueError(f"l_top={l_top} < {minimo}: k^2 * 2^(l_top*t) precisa ser >= n={n}")
+        l_top = minimo
+    frontier_cls = FRONTIERS[frontier]
+
+    # Pred em struct-of-arrays: pai e peso da aresta (pai -> v) em arrays
+    # tipados, sem um objeto por vértice; db e hops idem
+    db = array("d", [INF]) * n
+    hops = array("i", bytes(4 * n))
+    pred_parent = array("i", [NO_PRED]) * n
+    pred_w = array("d", bytes(8 * n))
     db[s] = 0.0
-    pred[s].parent = None
+
+    c = instrumentacao.ativos
+    if c is not None:
+        adj = instrumentacao.GrafoContado(adj, c)
+        pred_parent = instrumentacao.EscritasContadas(pred_parent, c)
 
     # Top level: BMSSP(l_top, inf, {s})
-    bmssp(l_top, INF, {s}, adj, db, pred, k, t)
+    marks = _Marks(n, l_top)
+    bmssp(l_top, INF_BOUND, {s}, adj, db, hops, pred_parent, pred_w, k, t, frontier_cls, marks)
+    if c is not None:
+        pred_parent = pred_parent.dados
 
-    pred_parent = [p.parent for p in pred]
+    if with_weights:
+        return db, pred_parent, pred_w
     return db, pred_parent
 
 
@@ -331,6 +740,7 @@ if __name__ == "__main__":
         [],                        # Vizinhos do 3 (4) - Sem saída
         [(3, 1)]                   # Vizinhos do 4 (5)
     ]
-    dist, pred = sssp_break_sorting_barrier(adj_list, 0)
-    print("dist:", dist)
-    print("pred:", pred)
+    for frontier in FRONTIERS:
+        dist, pred = sssp_break_sorting_barrier(adj_list, 0, frontier=frontier)
+        print(f"[{frontier}] dist:", list(dist))
+        print(f"[{frontier}] pred:", list(pred))
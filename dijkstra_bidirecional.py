@@ -0,0 +1,96 @@
+# dijkstra_bidirecional.py
+# Dijkstra bidirecional para consultas ponto a ponto (src -> target).
+#
+# Duas buscas simultâneas: para frente a partir de src no grafo, e para trás a
+# partir de target no grafo transposto (CSRGraph.reverse(), montado uma vez e
+# guardado no grafo). A cada passo avança a fronteira de menor topo; mu guarda
+# o melhor caminho src -> v -> target visto até agora, e a busca para quando
+#     topo_frente + topo_tras >= mu
+# já que nenhum caminho ainda não visto pode ser menor que essa soma.
+#
+# Em grafos "de estrada" cada busca cobre aproximadamente um disco de raio
+# d/2, em vez do disco de raio d do Dijkstra unidirecional.
+# Distâncias e predecessores ficam em dicts: só os vértices tocados pagam.
+#
+# Grafo: CSRGraph (o transposto fica em cache no objeto) ou lista de
+# adjacência adj[u] = list[(v, w)], w >= 0 (convertida a cada chamada).
+
+from __future__ import annotations
+import heapq
+from typing import List, Tuple
+
+from grafo_csr import CSRGraph
+
+INF = float("inf")
+
+
+def bidirectional_dijkstra(graph, src: int, target: int) -> Tuple[float, List[int]]:
+    """
+    Retorna (distância, caminho) de src até target; (inf, []) se inalcançável.
+    """
+    if src == target:
+        return 0.0, [src]
+    g = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adj_list(graph)
+    lados = (g, g.reverse())
+
+    dist = ({src: 0.0}, {target: 0.0})
+    pred = ({}, {})
+    heaps = ([(0.0, src)], [(0.0, target)])
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    mu = INF
+    meio = -1
+    while heaps[0] and heaps[1]:
+        topo_f = heaps[0][0][0]
+        topo_b = heaps[1][0][0]
+        if topo_f + topo_b >= mu:
+            break
+        # avança o lado de menor topo (0 = frente, 1 = trás)
+        lado = 0 if topo_f <= topo_b else 1
+        d_lado, d_outro = dist[lado], dist[1 - lado]
+        p_lado, heap = pred[lado], heaps[lado]
+
+        du, u = heappop(heap)
+        if du > d_lado[u]:
+            continue
+        for v, w in lados[lado][u]:
+            nd = du + w
+            if nd < d_lado.get(v, INF):
+                d_lado[v] = nd
+                p_lado[v] = u
+                heappush(heap, (nd, v))
+            dv_outro = d_outro.get(v)
+            if dv_outro is not None and nd + dv_outro < mu:
+                mu = nd + dv_outro
+                meio = v
+
+    if meio == -1:
+        return INF, []
+
+    # src -> meio pela árvore da frente, meio -> target pela árvore de trás
+    caminho = [meio]
+    v = meio
+    while v != src:
+        v = pred[0][v]
+        caminho.append(v)
+    caminho.reverse()
+    v = meio
+    while v != target:
+        v = pred[1][v]
+        caminho.append(v)
+    return mu, caminho
+
+
+if __name__ == "__main__":
+    adj_list = [
+        [(1, 4), (2, 2)],
+        [(2, 3), (3, 2), (4, 3)],
+        [(1, 1), (3, 4), (4, 5)],
+        [],
+        [(3, 1)],
+    ]
+    g = CSRGraph.from_adj_list(adj_list)
+    for t in range(len(g)):
+        print(f"0 -> {t}:", bidirectional_dijkstra(g, 0, t))
+    print("3 -> 0:", bidirectional_dijkstra(g, 3, 0))
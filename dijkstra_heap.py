@@ -0,0 +1,124 @@
+# dijkstra_heap.py
+# Dijkstra com heap binária (heapq) sobre lista de adjacência ou CSRGraph.
+#
+# Custo O((V + E) log V), contra O(V^2) do dijkstra_matrix: a busca do mínimo
+# sai do heap e o relaxamento percorre só os vizinhos de u.
+# decrease-key é "lazy" (como no FrontierDS): empilha a nova entrada e descarta
+# as obsoletas na hora do pop.
+#
+# Com target=..., para assim que o alvo é fechado (consulta ponto a ponto).
+#
+# Grafo: adj[u] = list[(v, w)] com w >= 0, ou CSRGraph (grafo_csr.py).
+#
+# Contadores (instrumentacao.py): expansoes, relaxacoes, pushes, pops,
+# melhorias (= pushes) e obsoletas.
+
+from __future__ import annotations
+import heapq
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+import instrumentacao
+
+INF = float("inf")
+
+# Convenção de predecessor: array compacto de int32, -1 = sem predecessor
+NO_PRED = -1
+
+
+def dijkstra_heap(
+    adj,
+    src: int,
+    target: Optional[int] = None,
+) -> Tuple[List[float], array]:
+    """
+    Entrada:
+        adj: lista de adjacência ou CSRGraph.
+        src: vértice de origem.
+        target: se dado, encerra assim que target sai do heap.
+    Retorna:
+        - dist: distâncias. Com target, só os vértices fechados antes dele
+          (incluindo o próprio target) têm valor final; os demais são
+          estimativas (ou inf).
+        - pred: predecessor de cada vértice (-1 se não houver).
+    """
+    n = len(adj)
+    dist = [INF] * n
+    pred = array("i", [NO_PRED]) * n
+    dist[src] = 0.0
+
+    heap: List[Tuple[float, int]] = [(0.0, src)]
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    c = instrumentacao.ativos
+    if c is not None:
+        adj = instrumentacao.GrafoContado(adj, c)
+        heappush, heappop = instrumentacao.heap_contado(c)
+        antes = (c["pushes"], c["pops"] - c["expansoes"])
+
+    alvo = 0
+    while heap:
+        du, u = heappop(heap)
+        # lazy deletion: entrada obsoleta (u já saiu com distância menor)
+        if du > dist[u]:
+            continue
+        if u == target:
+            alvo = 1
+            break
+        for v, w in adj[u]:
+            nd = du + w
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                heappush(heap, (nd, v))
+
+    if c is not None:
+        # todo push vem de uma melhoria; todo pop ou expande u, ou é o alvo,
+        # ou é uma entrada obsoleta
+        c["melhorias"] += c["pushes"] - antes[0]
+        c["obsoletas"] += c["pops"] - c["expansoes"] - antes[1] - alvo
+    return dist, pred
+
+
+def reconstruct_path(pred: Sequence[int], src: int, target: int) -> List[int]:
+    """
+    Caminho src -> target a partir do array de predecessores.
+    Lista vazia se target não é alcançável.
+    """
+    if src == target:
+        return [src]
+    if pred[target] == NO_PRED:
+        return []
+    path = [target]
+    v = target
+    while v != src:
+        v = pred[v]
+        if v == NO_PRED:
+            return []
+        path.append(v)
+    path.reverse()
+    return path
+
+
+def shortest_path(adj, src: int, target: int) -> Tuple[float, List[int]]:
+    """
+    Consulta ponto a ponto: (distância, caminho) de src até target.
+    """
+    dist, pred = dijkstra_heap(adj, src, target=target)
+    return dist[target], reconstruct_path(pred, src, target)
+
+
+# --- Exemplo mínimo de uso ---
+if __name__ == "__main__":
+    adj_list = [
+        [(1, 4), (2, 2)],          # Vizinhos do 0 (1)
+        [(2, 3), (3, 2), (4, 3)],  # Vizinhos do 1 (2)
+        [(1, 1), (3, 4), (4, 5)],  # Vizinhos do 2 (3)
+        [],                        # Vizinhos do 3 (4) - Sem saída
+        [(3, 1)]                   # Vizinhos do 4 (5)
+    ]
+    dist, pred = dijkstra_heap(adj_list, 0)
+    print("dist:", dist)
+    print("pred:", list(pred))
+    print("0 -> 3:", shortest_path(adj_list, 0, 3))
@@ -0,0 +1,195 @@
+# geradores.py
+# Geradores de grafos aleatórios em O(V + E), com semente (random.Random(seed)),
+# devolvendo CSRGraph. Famílias:
+#   - gnp:        Erdős–Rényi G(n, p) dirigido, por "saltos geométricos"
+#                 (Batagelj & Brandes): em vez de sortear cada um dos n(n-1)
+#                 pares, sorteia direto quantos pares pular até a próxima aresta
+#   - grade_2d:   grade linhas x colunas, 4 vizinhos, arestas nos dois sentidos
+#   - geometrico: pontos no quadrado unitário ligados se a distância < raio,
+#                 peso = distância (parecido com malha viária); vizinhos
+#                 achados por células de lado raio, sem comparar todos os pares
+#   - lei_potencia: Barabási–Albert (anexação preferencial), graus em lei de
+#                 potência; arestas nos dois sentidos
+#   - dag_negativo: DAG (ordem topológica aleatória) com pesos possivelmente
+#                 negativos e sem ciclos, para Bellman-Ford / Johnson
+#
+# Pesos inteiros uniformes em [w_min, w_max], como no gerar_dados_teste.
+
+from __future__ import annotations
+import math
+import random
+from array import array
+from typing import Iterator, Tuple
+
+from grafo_csr import CSRGraph, TARGET_TYPE, WEIGHT_TYPE
+
+
+def _saltos(total: int, p: float, rng: random.Random) -> Iterator[int]:
+    """
+    Índices k em [0, total) escolhidos com probabilidade p cada, em O(1) por
+    índice escolhido: o salto até o próximo segue uma distribuição geométrica.
+    """
+    if p <= 0:
+        return
+    if p >= 1:
+        yield from range(total)
+        return
+    log_q = math.log(1.0 - p)
+    k = -1
+    while True:
+        k += 1 + int(math.log(1.0 - rng.random()) / log_q)
+        if k >= total:
+            return
+        yield k
+
+
+def gnp_pares(n: int, p: float, rng: random.Random) -> Iterator[Tuple[int, int]]:
+    """
+    Pares (u, v), u != v, de um G(n, p) dirigido, em ordem de u e depois v.
+    """
+    if n < 2:
+        return
+    for k in _saltos(n * (n - 1), p, rng):
+        u, j = divmod(k, n - 1)
+        yield u, (j if j < u else j + 1)
+
+
+class _Arestas:
+    # Acumula arestas em arrays compactos e monta o CSR no fim
+    def __init__(self, rng, w_min, w_max):
+        self.src = array(TARGET_TYPE)
+        self.dst = array(TARGET_TYPE)
+        self.wts = array(WEIGHT_TYPE)
+        self.rng = rng
+        self.w_min = w_min
+        self.w_max = w_max
+
+    def add(self, u, v, w=None):
+        self.src.append(u)
+        self.dst.append(v)
+        self.wts.append(self.rng.randint(self.w_min, self.w_max) if w is None else w)
+
+    def add_duas(self, u, v, w=None):
+        # aresta não dirigida: mesmo peso nos dois sentidos
+        if w is None:
+            w = self.rng.randint(self.w_min, self.w_max)
+        self.add(u, v, w)
+        self.add(v, u, w)
+
+    def csr(self, n):
+        return CSRGraph.from_arrays(n, self.src, self.dst, self.wts)
+
+
+def gnp(n: int, p: float, seed=None, w_min: int = 1, w_max: int = 10) -> CSRGraph:
+    rng = random.Random(seed)
+    arestas = _Arestas(rng, w_min, w_max)
+    for u, v in gnp_pares(n, p, rng):
+        arestas.add(u, v)
+    return arestas.csr(n)
+
+
+def grade_2d(linhas: int, colunas: int, seed=None, w_min: int = 1, w_max: int = 10) -> CSRGraph:
+    """
+    Vértice (r, c) = r * colunas + c.
+    """
+    rng = random.Random(seed)
+    arestas = _Arestas(rng, w_min, w_max)
+    for r in range(linhas):
+        for c in range(colunas):
+            u = r * colunas + c
+            if c + 1 < colunas:
+                arestas.add_duas(u, u + 1)
+            if r + 1 < linhas:
+                arestas.add_duas(u, u + colunas)
+    return arestas.csr(linhas * colunas)
+
+
+def geometrico(n: int, grau_medio: float = 6.0, seed=None) -> CSRGraph:
+    """
+    Grafo geométrico aleatório: raio escolhido para dar ~grau_medio vizinhos
+    (pi r^2 n = grau_medio); peso = distância euclidiana.
+    """
+    rng = random.Random(seed)
+    arestas = _Arestas(rng, 0, 0)
+    xs = [rng.random() for _ in range(n)]
+    ys = [rng.random() for _ in range(n)]
+    raio = math.sqrt(grau_medio / (math.pi * max(1, n)))
+    lado = max(1, int(1.0 / raio)) if raio > 0 else 1
+
+    celulas = {}
+    for v in range(n):
+        celulas.setdefault((int(xs[v] * lado), int(ys[v] * lado)), []).append(v)
+    raio2 = raio * raio
+    for (cx, cy), membros in celulas.items():
+        # cada par de células vizinhas visto uma vez: a própria e 4 das 8 vizinhas
+        for dx, dy in ((0, 0), (1, 0), (1, 1), (0, 1), (-1, 1)):
+            outros = celulas.get((cx + dx, cy + dy))
+            if outros is None:
+                continue
+            for u in membros:
+                for v in outros:
+                    if (dx, dy) == (0, 0) and v <= u:
+                        continue
+                    d2 = (xs[u] - xs[v]) ** 2 + (ys[u] - ys[v]) ** 2
+                    if d2 < raio2:
+                        arestas.add_duas(u, v, math.sqrt(d2))
+    return arestas.csr(n)
+
+
+def lei_potencia(n: int, m_por_vertice: int = 3, seed=None, w_min: int = 1, w_max: int = 10) -> CSRGraph:
+    """
+    Barabási–Albert: cada vértice novo liga-se a m_por_vertice vértices
+    existentes escolhidos com probabilidade proporcional ao grau (sorteio
+    uniforme na lista de extremidades de arestas).
+    """
+    rng = random.Random(seed)
+    arestas = _Arestas(rng, w_min, w_max)
+    m0 = max(1, m_por_vertice)
+    extremidades = array(TARGET_TYPE)
+    # núcleo inicial: caminho com m0 + 1 vértices
+    for u in range(min(n, m0 + 1) - 1):
+        arestas.add_duas(u, u + 1)
+        extremidades.extend((u, u + 1))
+    for v in range(m0 + 1, n):
+        escolhidos = set()
+        while len(escolhidos) < m0:
+            escolhidos.add(extremidades[rng.randrange(len(extremidades))])
+        for u in escolhidos:
+            arestas.add_duas(u, v)
+            extremidades.extend((u, v))
+    return arestas.csr(n)
+
+
+def dag_negativo(n: int, p: float, seed=None, w_min: int = -5, w_max: int = 10) -> CSRGraph:
+    """
+    DAG G(n, p): ordem topológica aleatória, aresta só de posição menor para
+    maior. Pesos em [w_min, w_max] (podem ser negativos; não há ciclos).
+    """
+    rng = random.Random(seed)
+    arestas = _Arestas(rng, w_min, w_max)
+    ordem = list(range(n))
+    rng.shuffle(ordem)
+    # pares i < j da ordem, enumerados linha a linha: linha i tem n-1-i pares
+    i, inicio_linha = 0, 0
+    for k in _saltos(n * (n - 1) // 2, p, rng):
+        while k >= inicio_linha + (n - 1 - i):
+            inicio_linha += n - 1 - i
+            i += 1
+        j = i + 1 + (k - inicio_linha)
+        arestas.add(ordem[i], ordem[j])
+    return arestas.csr(n)
+
+
+if __name__ == "__main__":
+    import time
+
+    for nome, gerar in [
+        ("gnp", lambda: gnp(100_000, 10 / 100_000, seed=1)),
+        ("grade_2d", lambda: grade_2d(300, 300, seed=1)),
+        ("geometrico", lambda: geometrico(100_000, 6, seed=1)),
+        ("lei_potencia", lambda: lei_potencia(100_000, 3, seed=1)),
+        ("dag_negativo", lambda: dag_negativo(100_000, 5 / 100_000, seed=1)),
+    ]:
+        inicio = time.perf_counter()
+        g = gerar()
+        print(f"{nome:13s} {g}  {time.perf_counter() - inicio:.2f}s")
@@ -0,0 +1,105 @@
+# grafo_binario.py
+# Formato binário em disco para CSRGraph, lido com mmap (sem cópia).
+#
+# Layout (little-endian, seções alinhadas em 8 bytes):
+#   cabeçalho  : assinatura "CSRG", versão do formato, n, m e o deslocamento
+#                (em bytes, desde o início do arquivo) de cada seção
+#   offsets    : n + 1 int64
+#   targets    : m int32 (+ preenchimento até múltiplo de 8)
+#   weights    : m float64
+#
+# load_binary() mapeia o arquivo e devolve um CSRGraph cujos buffers são
+# memoryviews direto sobre o mapeamento: abrir um grafo de vários GB custa
+# só o cabeçalho, as páginas vêm do disco sob demanda e processos diferentes
+# que abrem o mesmo arquivo dividem o page cache do sistema. Nenhum objeto
+# Python é criado por aresta.
+
+from __future__ import annotations
+import mmap
+import struct
+import sys
+
+from grafo_csr import CSRGraph, OFFSET_TYPE, TARGET_TYPE, WEIGHT_TYPE
+
+_MAGICO = b"CSRG"
+_VERSAO_FORMATO = 1
+# assinatura, versão, n, m, início de offsets, targets, weights
+_CABECALHO = struct.Struct("<4sIqqqqq")
+
+
+def _alinhar(x: int) -> int:
+    return (x + 7) & ~7
+
+
+def _secoes(n: int, m: int):
+    ini_offsets = _alinhar(_CABECALHO.size)
+    ini_targets = ini_offsets + 8 * (n + 1)
+    ini_weights = _alinhar(ini_targets + 4 * m)
+    return ini_offsets, ini_targets, ini_weights, ini_weights + 8 * m
+
+
+def save_binary(g: CSRGraph, caminho: str) -> None:
+    """
+    Grava g no formato binário. Os buffers são escritos como estão (sem
+    conversão por elemento), então precisam estar nos tipos do CSR.
+    """
+    if sys.byteorder != "little":
+        raise ValueError("formato binário suportado só em máquinas little-endian")
+    n, m = g.n, g.num_edges
+    ini_offsets, ini_targets, ini_weights, _fim = _secoes(n, m)
+    with open(caminho, "wb") as f:
+        f.write(_CABECALHO.pack(_MAGICO, _VERSAO_FORMATO, n, m, ini_offsets, ini_targets, ini_weights))
+        for inicio, buf in ((ini_offsets, g.offsets), (ini_targets, g.targets), (ini_weights, g.weights)):
+            f.write(bytes(inicio - f.tell()))
+            f.write(memoryview(buf).cast("B"))
+
+
+def load_binary(caminho: str, writable: bool = False) -> CSRGraph:
+    """
+    Abre um grafo gravado por save_binary() via mmap, sem copiar as arestas.
+    writable=True mapeia em modo cópia-na-escrita (ACCESS_COPY): set_weight
+    funciona, mas as mudanças ficam só na memória do processo.
+    """
+    with open(caminho, "rb") as f:
+        acesso = mmap.ACCESS_COPY if writable else mmap.ACCESS_READ
+        mm = mmap.mmap(f.fileno(), 0, access=acesso)
+
+    if len(mm) < _CABECALHO.size:
+        raise ValueError(f"{caminho}: arquivo curto demais para um grafo binário")
+    magico, versao, n, m, ini_offsets, ini_targets, ini_weights = _CABECALHO.unpack_from(mm)
+    if magico != _MAGICO:
+        raise ValueError(f"{caminho}: não é um grafo binário (assinatura {magico!r})")
+    if versao != _VERSAO_FORMATO:
+        raise ValueError(f"{caminho}: versão do formato {versao} não suportada")
+    if (ini_offsets, ini_targets, ini_weights, len(mm)) != _secoes(n, m):
+        raise ValueError(f"{caminho}: tamanho ou seções inconsistentes com n={n}, m={m}")
+
+    # as views mantêm o mmap vivo; ele é fechado quando o grafo é coletado
+    buf = memoryview(mm)
+    offsets = buf[ini_offsets:ini_targets].cast(OFFSET_TYPE)
+    targets = buf[ini_targets:ini_targets + 4 * m].cast(TARGET_TYPE)
+    weights = buf[ini_weights:ini_weights + 8 * m].cast(WEIGHT_TYPE)
+    return CSRGraph(offsets, targets, weights)
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    from dijkstra_heap import dijkstra_heap
+
+    adj_list = [
+        [(1, 4), (2, 2)],
+        [(2, 3), (3, 2), (4, 3)],
+        [(1, 1), (3, 4), (4, 5)],
+        [],
+        [(3, 1)],
+    ]
+    caminho = os.path.join(tempfile.gettempdir(), "grafo_exemplo.csrg")
+    save_binary(CSRGraph.from_adj_list(adj_list), caminho)
+    print("bytes no disco:", os.path.getsize(caminho))
+
+    g = load_binary(caminho)
+    print(g, "dist:", dijkstra_heap(g, 0)[0])
+    del g
+    os.remove(caminho)
@@ -0,0 +1,342 @@
+# grafo_csr.py
+# Grafo dirigido compacto em formato CSR (compressed sparse row), compartilhado
+# por todos os algoritmos do trabalho.
+#
+# Em vez de um objeto Python por aresta (listas [u, v, w], tuplas (v, w)) ou de
+# uma matriz V x V, o grafo guarda três buffers contíguos:
+#   offsets[u] .. offsets[u+1]  -> faixa das arestas que saem de u
+#   targets[i], weights[i]      -> destino e peso da i-ésima aresta
+#
+# Os buffers são `array.array` por padrão, mas qualquer buffer indexável e
+# fatiável (memoryview, NumPy) serve.
+#
+# O grafo também se comporta como lista de adjacência:
+#   len(g) == n   e   for v, w in g[u]: ...
+# então funções escritas para adj[u] = list[(v, w)] o aceitam sem conversão.
+#
+# Mudanças de peso passam por set_weight() (ou touch(), para quem altera os
+# buffers direto): elas incrementam `version`, descartam o transposto e as
+# estatísticas (stats()) em cache e mudam fingerprint(), que é o que os caches
+# de resultado usam como chave.
+#
+# Para os modos multiprocesso, to_shared() copia os buffers para blocos de
+# multiprocessing.shared_memory uma única vez; os workers recebem só os nomes
+# (dict picklável) e remontam o grafo com attach_shared(), sem cópia.
+
+from __future__ import annotations
+import hashlib
+from array import array
+from multiprocessing import shared_memory
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+# int64 para offsets (E pode passar de 2^31), int32 para destinos, float64 para pesos
+OFFSET_TYPE = "q"
+TARGET_TYPE = "i"
+WEIGHT_TYPE = "d"
+
+
+class CSRGraph:
+    """
+    Grafo dirigido em CSR.
+      - n: número de vértices
+      - offsets: tamanho n + 1
+      - targets, weights: tamanho E
+    """
+
+    __slots__ = ("n", "offsets", "targets", "weights", "_reverse", "_version", "_fingerprint", "_stats", "__weakref__")
+
+    def __init__(self, offsets: Sequence[int], targets: Sequence[int], weights: Sequence[float]):
+        self.n = len(offsets) - 1
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._reverse = None
+        self._version = 0
+        self._fingerprint = None
+        self._stats = None
+
+    # ------------------------------------------------------------------
+    # Construtores
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_edges(cls, n: int, edges: Iterable[Sequence[float]]) -> "CSRGraph":
+        """
+        Monta o CSR a partir de uma lista de arestas [u, v, w] (ou tuplas).
+        Counting sort por origem: O(V + E), preserva a ordem das arestas de cada u.
+        """
+        src = array(TARGET_TYPE)
+        dst = array(TARGET_TYPE)
+        wts = array(WEIGHT_TYPE)
+        for u, v, w in edges:
+            src.append(u)
+            dst.append(v)
+            wts.append(w)
+        return cls.from_arrays(n, src, dst, wts)
+
+    @classmethod
+    def from_arrays(cls, n: int, src: Sequence[int], dst: Sequence[int], wts: Sequence[float]) -> "CSRGraph":
+        """
+        Monta o CSR a partir de três arrays paralelos (origem, destino, peso).
+        """
+        m = len(src)
+        offsets = array(OFFSET_TYPE, bytes(8 * (n + 1)))
+        for u in src:
+            offsets[u + 1] += 1
+        for u in range(n):
+            offsets[u + 1] += offsets[u]
+
+        targets = array(TARGET_TYPE, bytes(4 * m))
+        weights = array(WEIGHT_TYPE, bytes(8 * m))
+        pos = array(OFFSET_TYPE, offsets[:n])
+        for i in range(m):
+            u = src[i]
+            j = pos[u]
+            targets[j] = dst[i]
+            weights[j] = wts[i]
+            pos[u] = j + 1
+        return cls(offsets, targets, weights)
+
+    @classmethod
+    def from_adj_list(cls, adj: List[List[Tuple[int, float]]]) -> "CSRGraph":
+        """
+        Monta o CSR a partir de adj[u] = list[(v, w)].
+        """
+        n = len(adj)
+        offsets = array(OFFSET_TYPE, [0]) * (n + 1)
+        targets = array(TARGET_TYPE)
+        weights = array(WEIGHT_TYPE)
+        for u in range(n):
+            for v, w in adj[u]:
+                targets.append(v)
+                weights.append(w)
+            offsets[u + 1] = len(targets)
+        return cls(offsets, targets, weights)
+
+    @classmethod
+    def from_matrix(cls, matrix: List[List[float]]) -> "CSRGraph":
+        """
+        Monta o CSR a partir de uma matriz de adjacência onde 0 indica ausência
+        de aresta (mesma convenção do dijkstra_matrix).
+        """
+        n = len(matrix)
+        offsets = array(OFFSET_TYPE, [0]) * (n + 1)
+        targets = array(TARGET_TYPE)
+        weights = array(WEIGHT_TYPE)
+        for u in range(n):
+            row = matrix[u]
+            for v in range(n):
+                if row[v] != 0:
+                    targets.append(v)
+                    weights.append(row[v])
+            offsets[u + 1] = len(targets)
+        return cls(offsets, targets, weights)
+
+    # ------------------------------------------------------------------
+    # Acesso
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, u: int) -> Iterator[Tuple[int, float]]:
+        # Vizinhos de u como pares (v, w), igual a adj[u] na lista de adjacência
+        a = self.offsets[u]
+        b = self.offsets[u + 1]
+        return zip(self.targets[a:b], self.weights[a:b])
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def out_degree(self, u: int) -> int:
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def edge_sources(self) -> array:
+        """
+        Array com a origem de cada aresta (paralelo a targets/weights).
+        Permite varrer todas as arestas com zip(src, targets, weights).
+        """
+        src = array(TARGET_TYPE, bytes(4 * self.num_edges))
+        offsets = self.offsets
+        for u in range(self.n):
+            for i in range(offsets[u], offsets[u + 1]):
+                src[i] = u
+        return src
+
+    def edges(self) -> Iterator[Tuple[int, int, float]]:
+        """
+        Itera sobre as arestas como (u, v, w).
+        """
+        return zip(self.edge_sources(), self.targets, self.weights)
+
+    def reverse(self) -> "CSRGraph":
+        """
+        Grafo transposto (arestas v -> u), montado na primeira chamada e
+        guardado no próprio objeto; o transposto aponta de volta para este.
+        Usado pelas buscas para trás (Dijkstra bidirecional, ALT).
+        """
+        if self._reverse is None:
+            r = CSRGraph.from_arrays(self.n, self.targets, self.edge_sources(), self.weights)
+            r._reverse = self
+            self._reverse = r
+        return self._reverse
+
+    # ------------------------------------------------------------------
+    # Mudanças e identidade do conteúdo
+    # ------------------------------------------------------------------
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def touch(self) -> None:
+        """
+        Registra uma mudança feita direto nos buffers.
+        """
+        self._version += 1
+        self._fingerprint = None
+        self._reverse = None
+        self._stats = None
+
+    def set_weight(self, u: int, v: int, w: float) -> None:
+        """
+        Troca o peso da aresta u -> v (a primeira, se houver paralelas).
+        """
+        for j in range(self.offsets[u], self.offsets[u + 1]):
+            if self.targets[j] == v:
+                self.weights[j] = w
+                self.touch()
+                return
+        raise ValueError(f"aresta ({u}, {v}) não existe")
+
+    def fingerprint(self) -> str:
+        """
+        Hash do conteúdo (n + os três buffers), recalculado só depois de
+        mudanças. Grafos iguais têm o mesmo fingerprint.
+        """
+        if self._fingerprint is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(self.n.to_bytes(8, "little"))
+            for buf in (self.offsets, self.targets, self.weights):
+                h.update(buf)
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def stats(self) -> dict:
+        """
+        Estatísticas usadas para escolher o algoritmo (despacho.py), calculadas
+        uma vez e guardadas até a próxima mudança:
+          n, m, densidade (m / (n (n - 1))), min_peso, negativos (algum peso
+          < 0) e inteiros (todos os pesos inteiros).
+        """
+        if self._stats is None:
+            n, m = self.n, self.num_edges
+            min_peso = min(self.weights) if m else 0.0
+            self._stats = {
+                "n": n,
+                "m": m,
+                "densidade": m / (n * (n - 1)) if n > 1 else 0.0,
+                "min_peso": min_peso,
+                "negativos": min_peso < 0,
+                "inteiros": all(map(float.is_integer, map(float, self.weights))),
+            }
+        return self._stats
+
+    def to_adj_list(self) -> List[List[Tuple[int, float]]]:
+        return [list(self[u]) for u in range(self.n)]
+
+    # ------------------------------------------------------------------
+    # Memória compartilhada
+    # ------------------------------------------------------------------
+    def to_shared(self) -> Tuple["CSRGraph", dict, list]:
+        """
+        Copia offsets/targets/weights para memória compartilhada.
+        Retorna:
+          - o grafo sobre os buffers compartilhados (memoryview),
+          - meta: dict picklável para attach_shared() nos workers,
+          - blocos: pares (shm, view) a liberar com close_shared(..., unlink=True).
+        """
+        blocos = [
+            share_array(OFFSET_TYPE, self.offsets),
+            share_array(TARGET_TYPE, self.targets),
+            share_array(WEIGHT_TYPE, self.weights),
+        ]
+        meta = {
+            "n": self.n,
+            "m": self.num_edges,
+            "names": tuple(shm.name for shm, _view in blocos),
+        }
+        g = CSRGraph(*(view for _shm, view in blocos))
+        return g, meta, blocos
+
+    @classmethod
+    def attach_shared(cls, meta: dict) -> Tuple["CSRGraph", list]:
+        """
+        Remonta (sem cópia) um grafo publicado por to_shared() em outro processo.
+        Retorna o grafo e os blocos, a liberar com close_shared(blocos).
+        """
+        n, m = meta["n"], meta["m"]
+        tamanhos = (n + 1, m, m)
+        tipos = (OFFSET_TYPE, TARGET_TYPE, WEIGHT_TYPE)
+        blocos = [attach_array(nome, tc, k) for nome, tc, k in zip(meta["names"], tipos, tamanhos)]
+        return cls(*(view for _shm, view in blocos)), blocos
+
+    def __repr__(self) -> str:
+        return f"CSRGraph(n={self.n}, m={self.num_edges})"
+
+
+# ----------------------------------------------------------------------
+# Arrays em memória compartilhada (usados pelo CSR e pelos vetores de
+# distância dos modos paralelos)
+# ----------------------------------------------------------------------
+def share_array(typecode: str, data, length: int = None) -> Tuple[shared_memory.SharedMemory, memoryview]:
+    """
+    Cria um bloco compartilhado com o conteúdo de data (ou length zeros, se
+    data for None) e devolve (shm, view), view = memoryview tipado do bloco.
+    """
+    itemsize = array(typecode).itemsize
+    if data is not None:
+        length = len(data)
+    nbytes = itemsize * length
+    # SharedMemory não aceita size=0
+    shm = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+    view = shm.buf[:nbytes].cast(typecode)
+    if data is not None and length:
+        view[:] = data if isinstance(data, (array, memoryview)) else array(typecode, data)
+    return shm, view
+
+
+def attach_array(name: str, typecode: str, length: int) -> Tuple[shared_memory.SharedMemory, memoryview]:
+    """
+    Abre um bloco criado por share_array() em outro processo.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf[:array(typecode).itemsize * length].cast(typecode)
+    return shm, view
+
+
+def close_shared(blocos: list, unlink: bool = False) -> None:
+    """
+    Solta as views e fecha os blocos; unlink=True (só no processo que criou)
+    também remove o segmento do sistema.
+    """
+    for shm, view in blocos:
+        view.release()
+        shm.close()
+        if unlink:
+            shm.unlink()
+
+
+if __name__ == "__main__":
+    adj_list = [
+        [(1, 4), (2, 2)],
+        [(2, 3), (3, 2), (4, 3)],
+        [(1, 1), (3, 4), (4, 5)],
+        [],
+        [(3, 1)],
+    ]
+    g = CSRGraph.from_adj_list(adj_list)
+    print(g)
+    print("offsets:", list(g.offsets))
+    print("targets:", list(g.targets))
+    print("weights:", list(g.weights))
+    for u in range(len(g)):
+        print(u, list(g[u]))
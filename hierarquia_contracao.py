@@ -0,0 +1,327 @@
+# hierarquia_contracao.py
+# Contraction Hierarchies (Geisberger et al.) para consultas ponto a ponto
+# repetidas em um grafo estático: pré-processa uma vez, consulta muitas vezes.
+#
+# Pré-processamento:
+#   - ordem dos vértices pela "diferença de arestas": atalhos que a contração
+#     criaria - arestas removidas + vizinhos já contraídos (espalha a ordem).
+#     Fila de prioridade com atualização preguiçosa: ao sair do topo, a
+#     prioridade é recalculada e o vértice volta para a fila se piorou;
+#   - contrair v: para cada par u -> v -> x, busca de testemunha (Dijkstra
+#     limitado a partir de u, sem passar por v); se não há caminho de custo
+#     <= w(u,v) + w(v,x), insere o atalho u -> x (lembrando o meio v).
+#     Buscas que estouram limite_testemunha vértices assentados inserem o
+#     atalho mesmo assim (mais atalhos, nunca resposta errada);
+#   - se o grafo restante fica denso demais (grau médio > grau_nucleo), para
+#     de contrair: esse núcleo fica no topo da hierarquia, sem atalhos;
+#   - grafo de busca em dois CSR: "up" com as arestas u -> x de rank
+#     crescente, "down" com as arestas u -> v de rank decrescente guardadas
+#     invertidas (v -> u), de modo que as duas buscas só sobem na hierarquia.
+#
+# Consulta: Dijkstra bidirecional (src no up, target no down), que para
+# quando o menor topo das duas filas já é >= mu; os atalhos do caminho são
+# desempacotados recursivamente (com pilha) em arestas originais.
+#
+# Grafo: lista de adjacência adj[u] = list[(v, w)] com w >= 0 (mesmo formato
+# do sssp_break_sorting_barrier) ou CSRGraph.
+
+from __future__ import annotations
+import heapq
+from array import array
+from typing import List, Tuple
+
+from grafo_csr import CSRGraph, OFFSET_TYPE, TARGET_TYPE, WEIGHT_TYPE
+
+INF = float("inf")
+
+# Meio de uma aresta original (não é atalho)
+SEM_MEIO = -1
+
+
+def _busca_testemunha(saida, origem, evitar, alvos, limite_dist, limite_assentados):
+    """
+    Dijkstra a partir de origem, ignorando `evitar`, até assentar todos os
+    `alvos`, passar de limite_dist ou assentar limite_assentados vértices.
+    As distâncias devolvidas (mesmo as não finais) são comprimentos de
+    caminhos reais.
+    """
+    dist = {origem: 0.0}
+    heap = [(0.0, origem)]
+    assentados = 0
+    faltam = len(alvos)
+    while heap:
+        d, x = heapq.heappop(heap)
+        if d > dist[x]:
+            continue
+        if d > limite_dist:
+            break
+        if x in alvos:
+            faltam -= 1
+            if faltam == 0:
+                break
+        assentados += 1
+        if assentados > limite_assentados:
+            break
+        for y, (w, _meio) in saida[x].items():
+            if y == evitar:
+                continue
+            nd = d + w
+            if nd < dist.get(y, INF):
+                dist[y] = nd
+                heapq.heappush(heap, (nd, y))
+    return dist
+
+
+def _atalhos(saida, entrada, v, limite_assentados):
+    """
+    Atalhos (u, x, custo) necessários para contrair v.
+    """
+    atalhos = []
+    if not saida[v]:
+        return atalhos
+    for u, (wu, _m) in entrada[v].items():
+        custos = [(x, wu + wx) for x, (wx, _m2) in saida[v].items() if x != u]
+        if not custos:
+            continue
+        limite = max(c for _x, c in custos)
+        dist = _busca_testemunha(saida, u, v, saida[v], limite, limite_assentados)
+        for x, c in custos:
+            if dist.get(x, INF) > c:
+                atalhos.append((u, x, c))
+    return atalhos
+
+
+def _montar_csr(n, arestas):
+    # arestas[v] = list[(destino, peso, meio)] -> (CSRGraph, array de meios)
+    offsets = array(OFFSET_TYPE, [0]) * (n + 1)
+    targets = array(TARGET_TYPE)
+    weights = array(WEIGHT_TYPE)
+    meios = array(TARGET_TYPE)
+    for v in range(n):
+        for x, w, m in arestas[v]:
+            targets.append(x)
+            weights.append(w)
+            meios.append(m)
+        offsets[v + 1] = len(targets)
+    return CSRGraph(offsets, targets, weights), meios
+
+
+def _indice_aresta(g: CSRGraph, u: int, alvo: int) -> int:
+    for j in range(g.offsets[u], g.offsets[u + 1]):
+        if g.targets[j] == alvo:
+            return j
+    raise KeyError((u, alvo))
+
+
+class ContractionHierarchy:
+    """
+    Hierarquia pronta para consultas.
+      - rank[v]: posição de v na ordem de contração
+      - up, meio_up: arestas para vértices de rank maior (busca da origem)
+      - down, meio_down: arestas invertidas vindas de rank maior (busca do alvo)
+      - num_atalhos: quantos atalhos foram inseridos
+      - tamanho_nucleo: vértices deixados sem contrair (ver build)
+    """
+
+    def __init__(self, rank, up, meio_up, down, meio_down, num_atalhos=0, tamanho_nucleo=0):
+        self.rank = rank
+        self.up = up
+        self.meio_up = meio_up
+        self.down = down
+        self.meio_down = meio_down
+        self.num_atalhos = num_atalhos
+        self.tamanho_nucleo = tamanho_nucleo
+
+    # ------------------------------------------------------------------
+    # Pré-processamento
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(
+        cls,
+        graph,
+        limite_testemunha: int = 64,
+        grau_nucleo: float = 24.0,
+    ) -> "ContractionHierarchy":
+        """
+        limite_testemunha: vértices assentados por busca de testemunha.
+        grau_nucleo: para de contrair quando o grau médio do que resta passa
+            deste valor. Em grafos sem hierarquia (aleatórios) o resto vira
+            quase completo e cada contração custa O(grau^2) buscas; esse
+            "núcleo" fica sem contrair, com suas arestas nos dois grafos de
+            busca (a consulta continua correta, só explora o núcleo inteiro).
+        """
+        n = len(graph)
+        # saida[u][x] = entrada[x][u] = (peso, meio); arestas paralelas ficam
+        # só com a menor, laços são descartados
+        saida = [dict() for _ in range(n)]
+        entrada = [dict() for _ in range(n)]
+        for u in range(n):
+            for v, w in graph[u]:
+                if u != v and w < saida[u].get(v, (INF,))[0]:
+                    saida[u][v] = (w, SEM_MEIO)
+                    entrada[v][u] = (w, SEM_MEIO)
+        m_resto = sum(len(d) for d in saida)
+
+        contraidos = array("i", bytes(4 * n))
+
+        def prioridade(v, atalhos):
+            return len(atalhos) - len(entrada[v]) - len(saida[v]) + contraidos[v]
+
+        rank = array("i", bytes(4 * n))
+        arestas_up: List[list] = [None] * n
+        arestas_down: List[list] = [None] * n
+        ordem = 0
+
+        if m_resto <= grau_nucleo * n:
+            fila = [(prioridade(v, _atalhos(saida, entrada, v, limite_testemunha)), v) for v in range(n)]
+            heapq.heapify(fila)
+        else:
+            fila = [(0, v) for v in range(n)]
+        # fila tem cada vértice restante exatamente uma vez
+        while fila and m_resto <= grau_nucleo * len(fila):
+            _p, v = heapq.heappop(fila)
+            atalhos = _atalhos(saida, entrada, v, limite_testemunha)
+            p = prioridade(v, atalhos)
+            if fila and p > fila[0][0]:
+                heapq.heappush(fila, (p, v))
+                continue
+
+            rank[v] = ordem
+            ordem += 1
+            # vizinhos restantes serão contraídos depois: rank maior que v
+            arestas_up[v] = [(x, w, m) for x, (w, m) in saida[v].items()]
+            arestas_down[v] = [(u, w, m) for u, (w, m) in entrada[v].items()]
+            m_resto -= len(saida[v]) + len(entrada[v])
+
+            for x in saida[v]:
+                del entrada[x][v]
+                contraidos[x] += 1
+            for u in entrada[v]:
+                del saida[u][v]
+                contraidos[u] += 1
+            saida[v] = {}
+            entrada[v] = {}
+
+            for u, x, c in atalhos:
+                if c < saida[u].get(x, (INF,))[0]:
+                    if x not in saida[u]:
+                        m_resto += 1
+                    saida[u][x] = (c, v)
+                    entrada[x][u] = (c, v)
+
+        # núcleo: o que sobrou na fila, no topo da ordem; cada aresta interna
+        # vai para o up da origem e, invertida, para o down do destino
+        nucleo = [v for _p, v in fila]
+        for v in nucleo:
+            rank[v] = ordem
+            ordem += 1
+            arestas_up[v] = [(x, w, m) for x, (w, m) in saida[v].items()]
+            arestas_down[v] = [(u, w, m) for u, (w, m) in entrada[v].items()]
+
+        # atalhos: cada aresta contraída aparece uma vez (up ou down do extremo
+        # de rank menor); as do núcleo aparecem nos dois, conta só o up
+        num_atalhos = sum(m != SEM_MEIO for arestas in arestas_up for _x, _w, m in arestas)
+        for v in range(n):
+            if rank[v] < n - len(nucleo):
+                num_atalhos += sum(m != SEM_MEIO for _u, _w, m in arestas_down[v])
+
+        up, meio_up = _montar_csr(n, arestas_up)
+        down, meio_down = _montar_csr(n, arestas_down)
+        return cls(rank, up, meio_up, down, meio_down, num_atalhos, len(nucleo))
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    def query(self, src: int, target: int) -> Tuple[float, List[int]]:
+        """
+        Retorna (distância, caminho em arestas originais); (inf, []) se
+        target não é alcançável.
+        """
+        if src == target:
+            return 0.0, [src]
+        grafos = (self.up, self.down)
+        dist = ({src: 0.0}, {target: 0.0})
+        # pred[lado][v] = (u, índice da aresta u -> v no CSR do lado)
+        pred = ({}, {})
+        heaps = ([(0.0, src)], [(0.0, target)])
+
+        mu = INF
+        meio = -1
+        while True:
+            topo_f = heaps[0][0][0] if heaps[0] else INF
+            topo_b = heaps[1][0][0] if heaps[1] else INF
+            if min(topo_f, topo_b) >= mu:
+                break
+            lado = 0 if topo_f <= topo_b else 1
+            d_lado, heap, p_lado = dist[lado], heaps[lado], pred[lado]
+
+            du, u = heapq.heappop(heap)
+            if du > d_lado[u]:
+                continue
+            d_outro = dist[1 - lado].get(u)
+            if d_outro is not None and du + d_outro < mu:
+                mu = du + d_outro
+                meio = u
+
+            g = grafos[lado]
+            targets, weights = g.targets, g.weights
+            for j in range(g.offsets[u], g.offsets[u + 1]):
+                v = targets[j]
+                nd = du + weights[j]
+                if nd < d_lado.get(v, INF):
+                    d_lado[v] = nd
+                    p_lado[v] = (u, j)
+                    heapq.heappush(heap, (nd, v))
+
+        if meio == -1:
+            return INF, []
+
+        # arestas (a, b, meio) do caminho na hierarquia, de src até target
+        arestas = []
+        v = meio
+        while v != src:
+            u, j = pred[0][v]
+            arestas.append((u, v, self.meio_up[j]))
+            v = u
+        arestas.reverse()
+        v = meio
+        while v != target:
+            u, j = pred[1][v]
+            # aresta do down guardada invertida: original é v -> u
+            arestas.append((v, u, self.meio_down[j]))
+            v = u
+
+        caminho = [src]
+        for a, b, m in arestas:
+            self._desempacotar(a, b, m, caminho)
+        return mu, caminho
+
+    def _desempacotar(self, a, b, m, caminho):
+        # Troca o atalho a -> b (meio m) por a -> m -> b até só restarem arestas
+        # originais; m foi contraído antes de a e b, então a -> m está no down
+        # de m (invertida) e m -> b no up de m.
+        pilha = [(a, b, m)]
+        while pilha:
+            a, b, m = pilha.pop()
+            if m == SEM_MEIO:
+                caminho.append(b)
+                continue
+            j_mb = _indice_aresta(self.up, m, b)
+            j_am = _indice_aresta(self.down, m, a)
+            pilha.append((m, b, self.meio_up[j_mb]))
+            pilha.append((a, m, self.meio_down[j_am]))
+
+
+if __name__ == "__main__":
+    adj_list = [
+        [(1, 4), (2, 2)],
+        [(2, 3), (3, 2), (4, 3)],
+        [(1, 1), (3, 4), (4, 5)],
+        [],
+        [(3, 1)],
+    ]
+    ch = ContractionHierarchy.build(adj_list)
+    print("rank:", list(ch.rank), "atalhos:", ch.num_atalhos, "núcleo:", ch.tamanho_nucleo)
+    for t in range(len(adj_list)):
+        print(f"0 -> {t}:", ch.query(0, t))
+    print("3 -> 0:", ch.query(3, 0))
@@ -0,0 +1,173 @@
+# importadores.py
+# Leitura incremental de grafos em arquivo, direto para CSRGraph:
+#   - DIMACS .gr (9th DIMACS Implementation Challenge, ex.: USA-road-*.gr)
+#       c comentário
+#       p sp <n> <m>
+#       a <u> <v> <w>        (vértices numerados a partir de 1)
+#   - CSV de arestas: u,v[,w] por linha (peso 1 se ausente), cabeçalho
+#     opcional detectado automaticamente.
+# Arquivos .gz são descompactados em streaming.
+#
+# O arquivo é lido em blocos de linhas (readlines com limite em bytes) e as
+# arestas vão para três arrays compactos (origem, destino, peso: 16 bytes por
+# aresta), nunca para listas [u, v, w] ou matriz V x V. No DIMACS o "p" dá m,
+# então os arrays são alocados uma vez só. Pico de memória ~ 28 bytes por
+# aresta (arrays de leitura + CSR montado por CSRGraph.from_arrays).
+#
+# progresso(lidas, total) é chamado a cada bloco (total = None no CSV);
+# imprimir_progresso serve de callback pronto.
+
+from __future__ import annotations
+import gzip
+import sys
+from array import array
+from typing import Callable, Optional
+
+from grafo_csr import CSRGraph, TARGET_TYPE, WEIGHT_TYPE
+
+# bytes de texto lidos por bloco
+TAMANHO_BLOCO = 1 << 22
+
+Progresso = Optional[Callable[[int, Optional[int]], None]]
+
+
+def _abrir(caminho: str):
+    if caminho.endswith(".gz"):
+        return gzip.open(caminho, "rt")
+    return open(caminho, "r")
+
+
+def imprimir_progresso(lidas: int, total: Optional[int]) -> None:
+    if total:
+        print(f"\r{lidas}/{total} arestas ({100 * lidas / total:.1f}%)", end="", file=sys.stderr)
+    else:
+        print(f"\r{lidas} arestas", end="", file=sys.stderr)
+
+
+def read_dimacs_gr(caminho: str, progresso: Progresso = None) -> CSRGraph:
+    """
+    Lê um arquivo DIMACS .gr e devolve o CSRGraph (vértices a partir de 0).
+    """
+    n = m = None
+    src = dst = wts = None
+    k = 0
+    with _abrir(caminho) as f:
+        while True:
+            linhas = f.readlines(TAMANHO_BLOCO)
+            if not linhas:
+                break
+            for linha in linhas:
+                tipo = linha[:1]
+                if tipo == "a":
+                    if m is None:
+                        raise ValueError(f"{caminho}: arco antes da linha 'p'")
+                    if k == m:
+                        raise ValueError(f"{caminho}: mais arcos que os {m} declarados")
+                    _a, u, v, w = linha.split()
+                    u = int(u) - 1
+                    v = int(v) - 1
+                    if not (0 <= u < n and 0 <= v < n):
+                        raise ValueError(f"{caminho}: vértice fora de 1..{n}: {linha.strip()!r}")
+                    src[k] = u
+                    dst[k] = v
+                    wts[k] = float(w)
+                    k += 1
+                elif tipo == "p":
+                    _p, _sp, n, m = linha.split()
+                    n, m = int(n), int(m)
+                    src = array(TARGET_TYPE, bytes(4 * m))
+                    dst = array(TARGET_TYPE, bytes(4 * m))
+                    wts = array(WEIGHT_TYPE, bytes(8 * m))
+                elif tipo == "c" or not linha.strip():
+                    continue
+                else:
+                    raise ValueError(f"{caminho}: linha inesperada: {linha.strip()!r}")
+            if progresso is not None and m is not None:
+                progresso(k, m)
+
+    if n is None:
+        raise ValueError(f"{caminho}: linha 'p sp n m' ausente")
+    if k != m:
+        raise ValueError(f"{caminho}: {k} arcos lidos, {m} declarados")
+    return CSRGraph.from_arrays(n, src, dst, wts)
+
+
+def read_csv_edges(
+    caminho: str,
+    n: Optional[int] = None,
+    delimiter: str = ",",
+    one_based: bool = False,
+    progresso: Progresso = None,
+) -> CSRGraph:
+    """
+    Lê um CSV u,v[,w] e devolve o CSRGraph.
+    n: número de vértices; se None, usa o maior índice + 1.
+    one_based: True se os vértices começam em 1.
+    """
+    src = array(TARGET_TYPE)
+    dst = array(TARGET_TYPE)
+    wts = array(WEIGHT_TYPE)
+    base = 1 if one_based else 0
+    maior = -1
+    primeira = True
+    with _abrir(caminho) as f:
+        while True:
+            linhas = f.readlines(TAMANHO_BLOCO)
+            if not linhas:
+                break
+            for linha in linhas:
+                campos = linha.split(delimiter)
+                if len(campos) < 2 or not linha.strip() or linha.startswith("#"):
+                    continue
+                try:
+                    u = int(campos[0]) - base
+                    v = int(campos[1]) - base
+                    w = float(campos[2]) if len(campos) > 2 and campos[2].strip() else 1.0
+                except ValueError:
+                    if primeira:
+                        primeira = False  # cabeçalho
+                        continue
+                    raise ValueError(f"{caminho}: linha inválida: {linha.strip()!r}")
+                primeira = False
+                if u < 0 or v < 0:
+                    raise ValueError(f"{caminho}: vértice negativo (one_based={one_based}): {linha.strip()!r}")
+                src.append(u)
+                dst.append(v)
+                wts.append(w)
+                if u > maior:
+                    maior = u
+                if v > maior:
+                    maior = v
+            if progresso is not None:
+                progresso(len(src), None)
+
+    if n is None:
+        n = maior + 1
+    elif maior >= n:
+        raise ValueError(f"{caminho}: vértice {maior} fora de 0..{n - 1}")
+    return CSRGraph.from_arrays(n, src, dst, wts)
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    from dijkstra_artigo import dijkstra_simplified_bands
+
+    pasta = tempfile.gettempdir()
+    gr = os.path.join(pasta, "exemplo.gr")
+    with open(gr, "w") as f:
+        f.write("c exemplo\np sp 5 9\n")
+        for u, v, w in [(1, 2, 4), (1, 3, 2), (2, 3, 3), (2, 4, 2), (2, 5, 3),
+                        (3, 2, 1), (3, 4, 4), (3, 5, 5), (5, 4, 1)]:
+            f.write(f"a {u} {v} {w}\n")
+    g = read_dimacs_gr(gr, progresso=imprimir_progresso)
+    print("\nDIMACS:", g, dijkstra_simplified_bands(g, g.n, 0))
+
+    csv = os.path.join(pasta, "exemplo.csv")
+    with open(csv, "w") as f:
+        f.write("origem,destino,peso\n0,1,4\n0,2,2\n2,1,1\n1,3,2\n")
+    g = read_csv_edges(csv)
+    print("CSV:", g, dijkstra_simplified_bands(g, g.n, 0))
+    os.remove(gr)
+    os.remove(csv)
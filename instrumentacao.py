@@ -0,0 +1,143 @@
+# instrumentacao.py
+# Contadores dos laços internos dos algoritmos de caminho mínimo: quantos
+# relaxamentos, entradas obsoletas no heap, baldes varridos, chamadas do
+# bmssp por nível etc. Servem para explicar os tempos do benchmark (por que o
+# Artigo ganha do Dijkstra Clássico em V=2000 e perde em V=100) em vez de
+# adivinhar.
+#
+# Desligado por padrão (ativos = None). Cada algoritmo lê `ativos` uma vez
+# por chamada; desligado, roda exatamente o mesmo laço de antes. Ligado, troca
+# o grafo, o array de predecessores e as funções do heap por versões que
+# contam (GrafoContado, EscritasContadas, heap_contado), então nenhum laço por
+# aresta ganha um `if` a mais. O que é contado direto no código fica em pontos
+# executados uma vez por chamada, por balde ou por vértice retirado.
+#
+# Uso:
+#   with contar() as c:
+#       dijkstra_heap(g, 0)
+#   print(c["relaxacoes"], c["obsoletas"])
+#
+# Chaves (as que o algoritmo não usa ficam ausentes):
+#   expansoes        vértices cujos vizinhos foram percorridos
+#   relaxacoes       arestas examinadas (tentativas de relaxamento)
+#   melhorias        relaxamentos que diminuíram uma distância
+#   pushes, pops     operações no heap
+#   obsoletas        entradas do heap descartadas (lazy deletion)
+#   varreduras       posições lidas na busca linear do mínimo (dijkstra_matrix,
+#                    dijkstra_dense)
+#   passadas         passadas sobre todas as arestas (bellman_ford_edgelist)
+#   baldes_varridos  baldes examinados, vazios inclusive  \
+#   baldes           baldes processados (não vazios)       > dijkstra_simplified_bands
+#   fases_leves      fases de arestas leves               /
+#   bmssp_nivel_<l>  chamadas do bmssp no nível l          \
+#   pull, pull_itens chamadas de D.pull() e vértices puxados |
+#   find_pivots      chamadas; find_pivots_cedo: retornos   > dijkstra_artigo_corrigido
+#                    antecipados (|W| > k|S|, P = S)        |
+#   base_case        chamadas; base_case_vertices: |U0|    /
+
+from __future__ import annotations
+import heapq
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator
+
+# Counter em uso, ou None (instrumentação desligada)
+ativos = None
+
+
+@contextmanager
+def contar() -> Iterator[Counter]:
+    """
+    Liga a instrumentação dentro do bloco e devolve o Counter que acumula as
+    contagens de todas as chamadas feitas nele. Blocos aninhados contam à parte.
+    """
+    global ativos
+    anterior = ativos
+    ativos = c = Counter()
+    try:
+        yield c
+    finally:
+        ativos = anterior
+
+
+class GrafoContado:
+    """
+    Embrulha um grafo (lista de adjacência ou CSRGraph): cada adj[u] conta
+    uma expansão e grau(u) relaxamentos.
+    """
+
+    __slots__ = ("adj", "c", "_grau")
+
+    def __init__(self, adj, c: Counter):
+        self.adj = adj
+        self.c = c
+        grau = getattr(adj, "out_degree", None)
+        self._grau = grau if grau is not None else (lambda u: len(adj[u]))
+
+    def __len__(self) -> int:
+        return len(self.adj)
+
+    def __getitem__(self, u: int):
+        c = self.c
+        c["expansoes"] += 1
+        c["relaxacoes"] += self._grau(u)
+        return self.adj[u]
+
+
+class EscritasContadas:
+    """
+    Embrulha um array escrito só quando uma distância melhora (ex.: o de
+    predecessores): cada escrita conta uma melhoria. O original fica em .dados.
+    """
+
+    __slots__ = ("dados", "c")
+
+    def __init__(self, dados, c: Counter):
+        self.dados = dados
+        self.c = c
+
+    def __len__(self) -> int:
+        return len(self.dados)
+
+    def __getitem__(self, i):
+        return self.dados[i]
+
+    def __setitem__(self, i, valor) -> None:
+        self.c["melhorias"] += 1
+        self.dados[i] = valor
+
+
+def heap_contado(c: Counter):
+    """
+    (heappush, heappop) que contam pushes e pops em c.
+    """
+    push = heapq.heappush
+    pop = heapq.heappop
+
+    def heappush(heap, item):
+        c["pushes"] += 1
+        push(heap, item)
+
+    def heappop(heap):
+        c["pops"] += 1
+        return pop(heap)
+
+    return heappush, heappop
+
+
+if __name__ == "__main__":
+    # rodando como script, este arquivo é o __main__: os algoritmos leem o
+    # `ativos` do módulo instrumentacao importado, não o daqui
+    import instrumentacao
+    from dijkstra_heap import dijkstra_heap
+
+    adj_list = [
+        [(1, 4), (2, 2)],
+        [(2, 3), (3, 2), (4, 3)],
+        [(1, 1), (3, 4), (4, 5)],
+        [],
+        [(3, 1)],
+    ]
+    with instrumentacao.contar() as c:
+        dijkstra_heap(adj_list, 0)
+    print(dict(c))
@@ -0,0 +1,114 @@
+# johnson.py
+# Caminhos mínimos entre todos os pares (Johnson) para grafos com arestas
+# negativas, montado a partir do que já existe no trabalho:
+#
+#   1. Bellman-Ford (bellman_ford_queue / SPFA) uma única vez, a partir de uma
+#      origem virtual ligada a todos os vértices com peso 0: dá os potenciais
+#      h(v) (ou denuncia um ciclo negativo).
+#   2. Repondera w'(u, v) = w(u, v) + h(u) - h(v) >= 0, o que preserva os
+#      caminhos mínimos.
+#   3. Dijkstra (dijkstra_heap, ou o BMSSP, que exige w >= 0) de cada vértice
+#      no grafo reponderado, opcionalmente em paralelo via batch_sssp, e
+#      desfaz a reponderação: d(u, v) = d'(u, v) - h(u) + h(v).
+#
+# Custo O(V·E + V·(V + E) log V), contra O(V²·E) de rodar
+# bellman_ford_edgelist a partir de cada vértice.
+
+from __future__ import annotations
+from array import array
+
+from bellman import bellman_ford_queue
+from grafo_csr import CSRGraph, TARGET_TYPE, WEIGHT_TYPE
+from sssp_lote import batch_sssp
+
+
+def potenciais(g: CSRGraph):
+    """
+    Potenciais h de Johnson: distâncias a partir de uma origem virtual (vértice
+    n) com aresta de peso 0 para todo vértice. None se houver ciclo negativo.
+    """
+    n = g.n
+    src = g.edge_sources()
+    src.extend(array(TARGET_TYPE, [n]) * n)
+    dst = array(TARGET_TYPE, g.targets)
+    dst.extend(range(n))
+    wts = array(WEIGHT_TYPE, g.weights)
+    wts.extend(array(WEIGHT_TYPE, bytes(8 * n)))
+    g_virtual = CSRGraph.from_arrays(n + 1, src, dst, wts)
+
+    h, _pred, ciclo = bellman_ford_queue(g_virtual, n + 1, len(src), n)
+    if ciclo is not None:
+        return None
+    return h[:n]
+
+
+def reponderar(g: CSRGraph, h) -> CSRGraph:
+    """
+    Grafo com w'(u, v) = w(u, v) + h(u) - h(v), reaproveitando offsets/targets.
+    """
+    offsets, targets, weights = g.offsets, g.targets, g.weights
+    novos = array(WEIGHT_TYPE, bytes(8 * g.num_edges))
+    for u in range(g.n):
+        hu = h[u]
+        for j in range(offsets[u], offsets[u + 1]):
+            # max(0, .): arredondamento de float não pode gerar peso negativo
+            novos[j] = max(0.0, weights[j] + hu - h[targets[j]])
+    return CSRGraph(offsets, targets, novos)
+
+
+def johnson(graph_edges, V, E, algorithm="dijkstra", workers=1, as_matrix=False):
+    """
+    Distâncias entre todos os pares.
+    Entrada:
+        graph_edges, V, E: como no bellman_ford_edgelist (lista [u, v, w] ou CSRGraph).
+        algorithm: "dijkstra" ou "bmssp" (qualquer chave de sssp_lote.ALGORITMOS
+                   que aceite w >= 0).
+        workers: > 1 distribui as origens entre processos (batch_sssp).
+        as_matrix: True devolve numpy.ndarray V x V.
+    Retorna a matriz de distâncias (linha u = distâncias a partir de u) como
+    lista de array('d'), ou None se houver ciclo negativo.
+    """
+    g = graph_edges if isinstance(graph_edges, CSRGraph) else CSRGraph.from_edges(V, graph_edges[:E])
+
+    h = potenciais(g)
+    if h is None:
+        print("Grafo contém ciclo de tamanho negativo")
+        return None
+    g_rep = reponderar(g, h)
+
+    if as_matrix:
+        import numpy as np
+        D = batch_sssp(g_rep, range(V), algorithm, workers, as_matrix=True)
+        hv = np.asarray(h, dtype=np.float64)
+        # inf - finito continua inf
+        D += hv[None, :] - hv[:, None]
+        return D
+
+    linhas = [None] * V
+    for s, dist in batch_sssp(g_rep, range(V), algorithm, workers):
+        hs = h[s]
+        for v in range(V):
+            dist[v] += h[v] - hs
+        linhas[s] = dist
+    return linhas
+
+
+if __name__ == "__main__":
+    # Mesmo grafo do bellman.py (com arestas negativas, sem ciclo negativo)
+    V = 6
+    edges = [
+        [0, 5, 8],
+        [0, 1, 10],
+        [5, 4, 1],
+        [4, 1, -4],
+        [4, 3, -1],
+        [1, 3, 2],
+        [3, 2, -2],
+        [2, 1, 1],
+    ]
+    print("Johnson (todos os pares):")
+    for u, linha in enumerate(johnson(edges, V, len(edges))):
+        print(u, list(linha))
+
+    # Ciclo negativo: 0 -> 1 -> 0 com soma -2
+    print(johnson([[0, 1, 1], [1, 0, -3]], 2, 2))
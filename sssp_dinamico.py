@@ -0,0 +1,185 @@
+# sssp_dinamico.py
+# SSSP dinâmico: mantém dist/pred de uma origem fixa e os repara após mudanças
+# em uma aresta, sem recalcular tudo (no espírito de Ramalingam-Reps).
+#
+#   - peso diminui / aresta nova: se dist[u] + w < dist[v], propaga a melhora
+#     a partir de v com um Dijkstra que só segue vértices que melhoram;
+#   - peso aumenta / aresta removida: só importa se (u, v) é aresta da árvore
+#     de caminhos mínimos (pred[v] == u). Os afetados são a subárvore de v:
+#     fora dela nenhuma distância muda. Cada afetado recebe a melhor
+#     estimativa vinda de vizinhos não afetados e um Dijkstra restrito aos
+#     afetados termina o reparo.
+#
+# Cada operação devolve quantos vértices foram tocados (0 = nada mudou).
+# Pesos >= 0 (ValueError na construção e em decrease/insert com peso
+# negativo: o reparo é um Dijkstra); o grafo fica em dicts de saída/entrada (uma aresta por par u, v)
+# para permitir mudanças.
+
+from __future__ import annotations
+import heapq
+from array import array
+from typing import Dict, List
+
+from dijkstra_heap import NO_PRED
+from grafo_csr import CSRGraph
+
+INF = float("inf")
+
+
+class DynamicSSSP:
+    """
+    Distâncias a partir de src mantidas sob mudanças de arestas.
+      - dist: lista de distâncias
+      - pred: predecessor de cada vértice (array int32, -1 = sem pai)
+    """
+
+    def __init__(self, graph, src: int):
+        if isinstance(graph, CSRGraph):
+            negativos = graph.stats()["negativos"]
+        else:
+            negativos = any(w < 0 for arestas in graph for _v, w in arestas)
+        if negativos:
+            raise ValueError("DynamicSSSP exige pesos >= 0")
+        n = len(graph)
+        self.src = src
+        self.saida: List[Dict[int, float]] = [dict() for _ in range(n)]
+        self.entrada: List[Dict[int, float]] = [dict() for _ in range(n)]
+        for u in range(n):
+            for v, w in graph[u]:
+                # arestas paralelas: fica a de menor peso
+                if w < self.saida[u].get(v, INF):
+                    self.saida[u][v] = w
+                    self.entrada[v][u] = w
+
+        self.dist = [INF] * n
+        self.pred = array("i", [NO_PRED]) * n
+        self.dist[src] = 0.0
+        self._propagar([(0.0, src)], None)
+
+    # ------------------------------------------------------------------
+    # Operações
+    # ------------------------------------------------------------------
+    def decrease_edge(self, u: int, v: int, w: float) -> int:
+        if w < 0:
+            raise ValueError(f"decrease_edge: peso negativo {w}")
+        atual = self._peso(u, v)
+        if w > atual:
+            raise ValueError(f"decrease_edge: novo peso {w} maior que o atual {atual}")
+        self._definir(u, v, w)
+        return self._melhorar(u, v, w)
+
+    def increase_edge(self, u: int, v: int, w: float) -> int:
+        atual = self._peso(u, v)
+        if w < atual:
+            raise ValueError(f"increase_edge: novo peso {w} menor que o atual {atual}")
+        self._definir(u, v, w)
+        return self._reparar(u, v)
+
+    def insert_edge(self, u: int, v: int, w: float) -> int:
+        """
+        Insere (u, v); se a aresta já existe, troca o peso (aumento ou diminuição).
+        """
+        if w < 0:
+            raise ValueError(f"insert_edge: peso negativo {w}")
+        atual = self.saida[u].get(v)
+        if atual is not None and w > atual:
+            return self.increase_edge(u, v, w)
+        self._definir(u, v, w)
+        return self._melhorar(u, v, w)
+
+    def delete_edge(self, u: int, v: int) -> int:
+        self._peso(u, v)
+        del self.saida[u][v]
+        del self.entrada[v][u]
+        return self._reparar(u, v)
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _peso(self, u, v):
+        w = self.saida[u].get(v)
+        if w is None:
+            raise ValueError(f"aresta ({u}, {v}) não existe")
+        return w
+
+    def _definir(self, u, v, w):
+        self.saida[u][v] = w
+        self.entrada[v][u] = w
+
+    def _propagar(self, heap, permitidos) -> int:
+        # Dijkstra a partir das entradas do heap; com `permitidos`, só relaxa
+        # vértices desse conjunto. Devolve quantos vértices mudaram de distância.
+        dist, pred, saida = self.dist, self.pred, self.saida
+        heapq.heapify(heap)
+        mudaram = set()
+        while heap:
+            d, x = heapq.heappop(heap)
+            if d > dist[x]:
+                continue
+            for y, w in saida[x].items():
+                nd = d + w
+                if nd < dist[y] and (permitidos is None or y in permitidos):
+                    dist[y] = nd
+                    pred[y] = x
+                    mudaram.add(y)
+                    heapq.heappush(heap, (nd, y))
+        return len(mudaram)
+
+    def _melhorar(self, u, v, w) -> int:
+        nd = self.dist[u] + w
+        if nd >= self.dist[v]:
+            return 0
+        self.dist[v] = nd
+        self.pred[v] = u
+        return 1 + self._propagar([(nd, v)], None)
+
+    def _reparar(self, u, v) -> int:
+        if self.pred[v] != u:
+            return 0
+        dist, pred, saida, entrada = self.dist, self.pred, self.saida, self.entrada
+
+        # subárvore de v na árvore de caminhos mínimos (filhos de x: vizinhos
+        # de saída com pred == x)
+        afetados = [v]
+        marcados = {v}
+        i = 0
+        while i < len(afetados):
+            x = afetados[i]
+            i += 1
+            for y in saida[x]:
+                if pred[y] == x and y not in marcados:
+                    marcados.add(y)
+                    afetados.append(y)
+
+        for x in afetados:
+            dist[x] = INF
+            pred[x] = NO_PRED
+        # estimativa inicial: melhor entrada vinda de fora da subárvore
+        heap = []
+        for x in afetados:
+            melhor, pai = INF, NO_PRED
+            for y, w in entrada[x].items():
+                if y not in marcados and dist[y] + w < melhor:
+                    melhor, pai = dist[y] + w, y
+            if pai != NO_PRED:
+                dist[x] = melhor
+                pred[x] = pai
+                heap.append((melhor, x))
+        self._propagar(heap, marcados)
+        return len(afetados)
+
+
+if __name__ == "__main__":
+    adj_list = [
+        [(1, 4), (2, 2)],
+        [(2, 3), (3, 2), (4, 3)],
+        [(1, 1), (3, 4), (4, 5)],
+        [],
+        [(3, 1)],
+    ]
+    dyn = DynamicSSSP(adj_list, 0)
+    print("inicial:", dyn.dist)
+    print("decrease 0->1 para 1, tocados:", dyn.decrease_edge(0, 1, 1), dyn.dist)
+    print("increase 0->1 para 9, tocados:", dyn.increase_edge(0, 1, 9), dyn.dist)
+    print("delete 2->1, tocados:", dyn.delete_edge(2, 1), dyn.dist)
+    print("insert 0->3 (1), tocados:", dyn.insert_edge(0, 3, 1), dyn.dist)
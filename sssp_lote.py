@@ -0,0 +1,191 @@
+# sssp_lote.py
+# SSSP em lote: distâncias a partir de muitas origens sobre o mesmo grafo.
+#
+# Chamar dijkstra_heap / sssp_break_sorting_barrier / bellman_ford_edgelist
+# uma origem por vez, em processos separados, paga a serialização do grafo e a
+# subida do interpretador a cada origem. Aqui:
+#   - o grafo vira CSR e é publicado uma única vez em memória compartilhada
+#     (CSRGraph.to_shared); cada worker o remonta no initializer, sem cópia;
+#   - as origens são distribuídas com imap_unordered e os resultados voltam
+#     conforme ficam prontos (streaming), como array('d') compacto;
+#   - com as_matrix=True, os workers escrevem direto nas linhas de uma matriz
+#     compartilhada len(sources) x n, devolvida como numpy.ndarray.
+#
+# Algoritmos disponíveis: ver ALGORITMOS.
+
+from __future__ import annotations
+import multiprocessing
+from array import array
+from typing import Iterator, Optional, Sequence, Tuple
+
+from bellman import bellman_ford_edgelist, bellman_ford_queue
+from dijkstra_artigo import dijkstra_simplified_bands
+from dijkstra_artigo_corrigido import sssp_break_sorting_barrier
+from dijkstra_heap import dijkstra_heap
+from grafo_csr import CSRGraph, attach_array, close_shared, share_array
+
+
+def _dijkstra(g, s):
+    return dijkstra_heap(g, s)[0]
+
+
+def _bmssp(g, s):
+    return sssp_break_sorting_barrier(g, s)[0]
+
+
+def _delta_stepping(g, s):
+    return dijkstra_simplified_bands(g, g.n, s)
+
+
+def _bellman_ford(g, s):
+    return bellman_ford_edgelist(g, g.n, g.num_edges, s)
+
+
+def _spfa(g, s):
+    dis, _pred, ciclo = bellman_ford_queue(g, g.n, g.num_edges, s)
+    return None if ciclo is not None else dis
+
+
+# nome -> função (grafo CSR, origem) -> distâncias (None = ciclo negativo)
+ALGORITMOS = {
+    "dijkstra": _dijkstra,
+    "bmssp": _bmssp,
+    "delta": _delta_stepping,
+    "bellman_ford": _bellman_ford,
+    "spfa": _spfa,
+}
+
+
+# ---------------------------------------------------------------------------
+# Lado do worker
+# ---------------------------------------------------------------------------
+# Estado dos processos do pool (um por processo, montado no initializer). O
+# modo workers=1 usa um dict próprio por chamada, nunca este: dois geradores
+# de batch_sssp no mesmo processo não podem dividir estado.
+_worker = {}
+
+
+def _montar_estado(estado, g, algorithm, blocos, nome_matriz, linhas):
+    estado["g"] = g
+    estado["algo"] = ALGORITMOS[algorithm]
+    estado["blocos"] = blocos
+    if nome_matriz is not None:
+        blocos.append(attach_array(nome_matriz, "d", linhas * g.n))
+        estado["matriz"] = blocos[-1][1]
+    return estado
+
+
+def _init_worker(meta, algorithm, nome_matriz, linhas):
+    g, blocos = CSRGraph.attach_shared(meta)
+    _montar_estado(_worker, g, algorithm, blocos, nome_matriz, linhas)
+
+
+def _resolver_com(estado, tarefa):
+    # tarefa = (linha, origem); devolve (linha, origem, dist ou None)
+    linha, s = tarefa
+    g = estado["g"]
+    dist = estado["algo"](g, s)
+    if dist is None:
+        return linha, s, None
+    matriz = estado.get("matriz")
+    if matriz is not None:
+        n = g.n
+        matriz[linha * n:(linha + 1) * n] = array("d", dist)
+        return linha, s, True
+    return linha, s, array("d", dist)
+
+
+def _resolver(tarefa):
+    return _resolver_com(_worker, tarefa)
+
+
+# ---------------------------------------------------------------------------
+# API
+# ---------------------------------------------------------------------------
+def _stream(
+    g: CSRGraph,
+    sources: Sequence[int],
+    algorithm: str,
+    workers: int,
+    chunksize: Optional[int],
+    nome_matriz: Optional[str] = None,
+) -> Iterator[Tuple[int, int, object]]:
+    tarefas = list(enumerate(sources))
+    if workers <= 1:
+        # roda no próprio processo, sem publicar o grafo, com estado local
+        estado = _montar_estado({}, g, algorithm, [], nome_matriz, len(tarefas))
+        try:
+            for tarefa in tarefas:
+                yield _resolver_com(estado, tarefa)
+        finally:
+            blocos_locais = estado.pop("blocos")
+            estado.clear()
+            close_shared(blocos_locais)
+        return
+
+    g_comp, meta, blocos = g.to_shared()
+    if chunksize is None:
+        # lotes pequenos: balanceia melhor quando o custo por origem varia
+        chunksize = max(1, len(tarefas) // (workers * 8))
+    pool = multiprocessing.Pool(workers, _init_worker, (meta, algorithm, nome_matriz, len(tarefas)))
+    try:
+        for resultado in pool.imap_unordered(_resolver, tarefas, chunksize):
+            yield resultado
+    finally:
+        pool.terminate()
+        pool.join()
+        del g_comp
+        close_shared(blocos, unlink=True)
+
+
+def batch_sssp(
+    graph,
+    sources: Sequence[int],
+    algorithm: str = "dijkstra",
+    workers: int = 1,
+    as_matrix: bool = False,
+    chunksize: Optional[int] = None,
+):
+    """
+    Distâncias a partir de cada origem em `sources`.
+    Entrada:
+        graph: CSRGraph ou lista de adjacência (convertida para CSR).
+        algorithm: chave de ALGORITMOS.
+        workers: número de processos (1 = no próprio processo).
+        as_matrix: False -> gerador de (origem, dist array('d')) na ordem em
+            que terminam; True -> numpy.ndarray len(sources) x n, linha i =
+            distâncias a partir de sources[i].
+    Para "bellman_ford"/"spfa", uma origem que alcança ciclo negativo vem com
+    dist None no gerador; na matriz, levanta ValueError.
+    """
+    if algorithm not in ALGORITMOS:
+        raise ValueError(f"algoritmo desconhecido: {algorithm!r} (opções: {sorted(ALGORITMOS)})")
+    g = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adj_list(graph)
+
+    if not as_matrix:
+        return ((s, dist) for _linha, s, dist in _stream(g, sources, algorithm, workers, chunksize))
+
+    import numpy as np
+
+    shm, view = share_array("d", None, len(sources) * g.n)
+    try:
+        for _linha, s, ok in _stream(g, sources, algorithm, workers, chunksize, shm.name):
+            if ok is None:
+                raise ValueError(f"ciclo negativo alcançável a partir de {s}")
+        return np.frombuffer(view, dtype=np.float64).reshape(len(sources), g.n).copy()
+    finally:
+        close_shared([(shm, view)], unlink=True)
+
+
+if __name__ == "__main__":
+    adj_list = [
+        [(1, 4), (2, 2)],
+        [(2, 3), (3, 2), (4, 3)],
+        [(1, 1), (3, 4), (4, 5)],
+        [],
+        [(3, 1)],
+    ]
+    g = CSRGraph.from_adj_list(adj_list)
+    for s, dist in batch_sssp(g, range(len(g)), workers=2):
+        print(s, list(dist))
+    print(batch_sssp(g, [0, 2], algorithm="bmssp", as_matrix=True))